@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from src.summarisation.extractive import summarize_texts
+
+WORDS = (
+    "council plan city cycling lanes budget schools housing prices energy rail strike union museum river flood "
+    "report minister election vote market shares growth inflation bank rates data privacy software release"
+).split()
+
+
+def make_text(rng: random.Random, sentences: int) -> str:
+    return " ".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 25))).capitalize() + "." for _ in range(sentences)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--sentences", type=int, default=80)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [make_text(rng, args.sentences) for _ in range(args.items)]
+    summarize_texts(texts[:1], [4])
+
+    started = time.perf_counter()
+    summarize_texts(texts, [4] * len(texts))
+    elapsed = time.perf_counter() - started
+    words = sum(len(text.split()) for text in texts)
+    print(f"{args.items} items, {words} words: {elapsed * 1000:.1f}ms ({elapsed * 1000 / args.items:.2f}ms/item)")
+
+
+if __name__ == "__main__":
+    main()
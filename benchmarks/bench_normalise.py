@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from src.ingestion.html_extract import PARSER, extract_html
+
+
+def newsletter_html(sections: int) -> str:
+    parts = ["<html><head><title>Weekly digest</title><style>td { padding: 4px; }</style></head><body><table>"]
+    for i in range(sections):
+        parts.append(
+            f"<tr><td><h2>Story {i}</h2>"
+            f"<p>Lorem ipsum dolor sit amet, <b>consectetur</b> adipiscing elit &amp; more text {i}. "
+            f"Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.</p>"
+            f'<a href="https://example.com/story/{i}">Read more</a> '
+            f'<a href="https://example.com/share/{i % 50}">Share</a>'
+            f'<img src="https://cdn.example.com/{i}.png" alt="" /></td></tr>'
+        )
+    parts.append("<script>window.track = true;</script></table></body></html>")
+    return "".join(parts)
+
+
+def legacy_extract(html: str) -> tuple[str, list]:
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for link in soup.find_all("a"):
+        href = link.get("href")
+        if href:
+            links.append(href)
+    links = list(dict.fromkeys(links))
+    text = " ".join(BeautifulSoup(html, "html.parser").get_text(" ").split())
+    return text, links
+
+
+def timed(fn, html: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = newsletter_html(args.sections)
+    legacy_text, legacy_links = legacy_extract(html)
+    parsed = extract_html(html)
+    assert parsed.text == legacy_text, "text mismatch"
+    assert parsed.links == legacy_links, "links mismatch"
+
+    legacy = timed(legacy_extract, html, args.repeat)
+    single = timed(extract_html, html, args.repeat)
+    print(f"html size: {len(html) / 1024:.0f} KiB, parser: {PARSER}")
+    print(f"legacy (2x BeautifulSoup): {legacy * 1000:.1f} ms")
+    print(f"single pass:               {single * 1000:.1f} ms")
+    print(f"speedup:                   {legacy / single:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
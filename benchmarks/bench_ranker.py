@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import List
+
+from src.selection.ranker import (
+    DEFAULT_TYPE_WEIGHTS,
+    CandidateBatch,
+    RecencyDecayRanker,
+    TimestampRanker,
+    score_item,
+)
+from src.utils.time import now_utc
+
+SOURCES = 200
+TYPES = list(DEFAULT_TYPE_WEIGHTS)
+
+
+def make_rows(count: int) -> List[SimpleNamespace]:
+    rng = random.Random(0)
+    now = now_utc()
+    return [
+        SimpleNamespace(
+            id=i,
+            source_id=f"source-{i % SOURCES}",
+            published_at=None if i % 50 == 0 else now - timedelta(seconds=rng.randrange(7 * 86400)),
+            ingested_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def per_item(rows, type_map) -> list:
+    scored = [(score_item(row.published_at, type_map[row.source_id], DEFAULT_TYPE_WEIGHTS), row) for row in rows]
+    scored.sort(key=lambda tup: (-tup[0], -tup[1].id))
+    return scored
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.count)
+    type_map = {f"source-{i}": TYPES[i % len(TYPES)] for i in range(SOURCES)}
+
+    batch_holder = {}
+    build = timed(lambda: batch_holder.setdefault("batch", CandidateBatch.from_rows(rows)))
+    batch = batch_holder["batch"]
+
+    print(f"{args.count} candidates")
+    print(f"{'per-item score_item + sort':<34} {timed(lambda: per_item(rows, type_map)):>8.3f}s")
+    print(f"{'CandidateBatch.from_rows':<34} {build:>8.3f}s")
+    for ranker in (TimestampRanker(source_type_map=type_map), RecencyDecayRanker(source_type_map=type_map)):
+        elapsed = timed(lambda: batch.order(ranker.score(batch)))
+        print(f"{type(ranker).__name__ + ' score + order':<34} {elapsed:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
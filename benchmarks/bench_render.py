@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from src.templating.render import create_env, prepare_render_data, render_newsletter
+
+TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "src" / "templating" / "templates"
+HTML = "newsletter_default.html.j2"
+TEXT = "newsletter_default.txt.j2"
+
+
+def recipient_data(index: int) -> dict:
+    items = [
+        {
+            "title": f"Story {n}",
+            "summary": "The council approved the cycling plan after a long debate. " * 3,
+            "source_id": "source",
+            "links": [f"https://example.com/{n}/{k}" for k in range(3)],
+        }
+        for n in range(20)
+    ]
+    return prepare_render_data(
+        newsletter={"name": "Demo", "frequency": "daily"},
+        period={"start": "2025-01-01", "end": "2025-01-02"},
+        recipient={"email": f"user{index}@example.com", "name": f"User {index}"},
+        items=items,
+        run_id=1,
+        app_base_url="https://news.example.com",
+        tracking_secret="secret",
+        open_tracking=True,
+        click_tracking=True,
+    )
+
+
+def fresh_env_render(data: dict) -> tuple[str, str]:
+    # What render_newsletter did before: a new environment, and so a
+    # recompile of both templates, for every recipient.
+    env = create_env(TEMPLATE_DIR)
+    return env.get_template(HTML).render(**data), env.get_template(TEXT).render(**data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipients", type=int, default=500)
+    args = parser.parse_args()
+
+    data = [recipient_data(i) for i in range(args.recipients)]
+    for name, render in (
+        ("new environment per recipient", fresh_env_render),
+        ("cached environment", lambda d: render_newsletter(TEMPLATE_DIR, HTML, TEXT, d)),
+    ):
+        started = time.perf_counter()
+        for recipient in data:
+            render(recipient)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<32} {elapsed:>7.3f}s {args.recipients / elapsed:>9.0f} recipients/s")
+
+
+if __name__ == "__main__":
+    main()
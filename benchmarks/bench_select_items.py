@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.db.models import Base, Item
+from src.ingestion.normalise import ItemData
+from src.ingestion.store import insert_items
+from src.selection.policy import select_items
+from src.selection.ranker import TimestampRanker, score_item
+from src.utils.time import now_utc
+
+SOURCES = 50
+WEIGHTS = {"rss": 1.0, "website_change": 1.1, "gmail_inbox": 0.9}
+
+
+def make_items(count: int) -> List[ItemData]:
+    now = now_utc()
+    return [
+        ItemData(
+            source_id=f"source-{i % SOURCES}",
+            title=f"Entry {i}",
+            content_text=f"Entry {i} body. " + "Lorem ipsum dolor sit amet " * 200,
+            url=f"https://example.com/{i}",
+            published_at=now - timedelta(seconds=i),
+            ingested_at=now,
+            links=[f"https://example.com/{i}/{n}" for n in range(10)],
+            fingerprint=f"{i:064x}",
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_select(session, source_ids, max_items_total, per_source_limit):
+    start = now_utc() - timedelta(days=2)
+    items = session.execute(
+        select(Item).where(Item.source_id.in_(source_ids)).where(Item.ingested_at >= start)
+    ).scalars().all()
+    scored = sorted(
+        ((score_item(item.published_at, "rss", WEIGHTS), item) for item in items), key=lambda t: t[0], reverse=True
+    )
+    counts = {}
+    selected = []
+    for _, item in scored:
+        if counts.get(item.source_id, 0) >= per_source_limit:
+            continue
+        selected.append(item)
+        counts[item.source_id] = counts.get(item.source_id, 0) + 1
+        if len(selected) >= max_items_total:
+            break
+    return selected
+
+
+def pool_select(session, source_ids, max_items_total, per_source_limit):
+    return select_items(
+        session,
+        source_ids=source_ids,
+        window_days=2,
+        max_items_total=max_items_total,
+        per_source_limit=per_source_limit,
+        ranker=TimestampRanker(type_weights=WEIGHTS),
+    )
+
+
+def measure(Session, select_fn) -> tuple[float, float]:
+    source_ids = [f"source-{i}" for i in range(SOURCES)]
+    with Session() as session:
+        # Warm up statement compilation and the page cache, then time
+        # without tracemalloc overhead and trace memory separately.
+        select_fn(session, source_ids, 20, 5)
+        started = time.perf_counter()
+        select_fn(session, source_ids, 20, 5)
+        elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    with Session() as session:
+        select_fn(session, source_ids, 20, 5)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    args = parser.parse_args()
+
+    print(f"{'items':>9} {'path':>7} {'seconds':>9} {'peak MB':>9}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            Base.metadata.create_all(engine)
+            Session = sessionmaker(bind=engine)
+            with Session() as session:
+                insert_items(session, make_items(size))
+                session.commit()
+            for name, select_fn in (("legacy", legacy_select), ("pool", pool_select)):
+                elapsed, peak = measure(Session, select_fn)
+                print(f"{size:>9} {name:>7} {elapsed:>9.2f} {peak:>9.1f}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
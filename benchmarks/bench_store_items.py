@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db.models import Base, Item
+from src.ingestion.normalise import ItemData
+from src.ingestion.store import insert_items
+from src.utils.time import now_utc
+
+
+def make_items(count: int) -> List[ItemData]:
+    now = now_utc()
+    return [
+        ItemData(
+            source_id=f"source-{i % 50}",
+            title=f"Entry {i}",
+            content_text="Lorem ipsum dolor sit amet " * 8,
+            url=f"https://example.com/{i}",
+            published_at=now,
+            ingested_at=now,
+            links=[f"https://example.com/{i}"],
+            fingerprint=f"{i:064x}",
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_store(session, items: List[ItemData]) -> int:
+    inserted = 0
+    for item in items:
+        exists = (
+            session.query(Item)
+            .filter(Item.source_id == item.source_id, Item.fingerprint == item.fingerprint)
+            .first()
+        )
+        if exists:
+            continue
+        session.add(
+            Item(
+                source_id=item.source_id,
+                title=item.title,
+                content_text=item.content_text,
+                url=item.url,
+                published_at=item.published_at,
+                ingested_at=item.ingested_at,
+                links=item.links,
+                fingerprint=item.fingerprint,
+            )
+        )
+        inserted += 1
+    session.commit()
+    return inserted
+
+
+def bulk_store(session, items: List[ItemData]) -> int:
+    result = insert_items(session, items)
+    session.commit()
+    return result.inserted
+
+
+def run(db_url: str, store, items: List[ItemData]) -> tuple[float, float]:
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    timings = []
+    for _ in range(2):
+        started = time.perf_counter()
+        with Session() as session:
+            store(session, items)
+        timings.append(time.perf_counter() - started)
+    engine.dispose()
+    return timings[0], timings[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--legacy-max", type=int, default=100000)
+    parser.add_argument("--db-url", help="defaults to a temporary SQLite file per run")
+    args = parser.parse_args()
+
+    print(f"{'items':>9} {'path':>7} {'fresh s':>9} {'items/s':>10} {'re-poll s':>10} {'items/s':>10}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        items = make_items(size)
+        for name, store in (("legacy", legacy_store), ("bulk", bulk_store)):
+            if name == "legacy" and size > args.legacy_max:
+                print(f"{size:>9} {name:>7} {'skipped (--legacy-max)':>41}")
+                continue
+            with tempfile.TemporaryDirectory() as tmp:
+                db_url = args.db_url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+                fresh, repoll = run(db_url, store, items)
+            print(f"{size:>9} {name:>7} {fresh:>9.2f} {size / fresh:>10.0f} {repoll:>10.2f} {size / repoll:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,39 +2,66 @@ from __future__ import annotations
 
 import argparse
 import logging
+import random
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select
 from pathlib import Path
 
 from src.db.models import (
     EmailSent,
     Event,
+    GmailSyncState,
     Group,
     GroupMember,
     Item,
+    ItemCandidate,
+    ItemSignature,
     NewsletterRun,
     NewsletterRunItem,
     Source,
+    SnapshotSighting,
+    SourceFetchState,
+    SummaryJob,
     User,
-    WebsiteSnapshot,
 )
-from src.db.session import get_session, init_engine
-from src.ingestion.dedupe import dedupe_items
+from src.db.migrations import MIGRATIONS, applied_versions, explain, run_migrations
+from src.db.session import get_engine, get_session, init_engine
+from src.ingestion.browser_pool import configure_browser_pool
 from src.ingestion.gmail_inbox import poll_gmail
 from src.ingestion.normalise import ItemData
+from src.ingestion.pipeline import IngestPipeline, SourceCounts
+from src.ingestion.poller import PollTask, log_poll_summary, run_polls, source_host
 from src.ingestion.rss import poll_rss
-from src.ingestion.website_change import WebsiteSnapshot as SnapData
-from src.ingestion.website_change import detect_change
+from src.ingestion.seen import fingerprint_index
+from src.ingestion.snapshot_store import latest_snapshot, prune_snapshots, record_snapshot
+from src.ingestion.store import StoreResult, insert_items
+from src.ingestion.website_change import WebsiteSnapshot, detect_change
 from src.logging_conf import configure_logging
-from src.selection.policy import select_items
-from src.settings import ConfigLoader, load_settings
+from src.selection.policy import (
+    DEFAULT_ENGAGEMENT_DAYS,
+    DEFAULT_NEAR_DUPLICATE_DISTANCE,
+    candidate_query,
+    select_items,
+)
+from src.selection.ranker import TimestampRanker, build_ranker
+from src.settings import ConfigLoader, Settings, load_settings
 from src.summarisation.ollama_provider import OllamaProvider
 from src.summarisation.openai_provider import OpenAIProvider
-from src.summarisation.provider import SummaryRequest, simple_summarize
-from src.templating.render import prepare_render_data, render_newsletter
+from src.summarisation.budget import TokenBudget
+from src.summarisation.cache import evict_summaries
+from src.summarisation.limits import ProviderLimits, RateLimitedProvider
+from src.summarisation.provider import SummaryRequest, request_for_rules
+from src.summarisation.queue import rules_by_source, summarize_pending
+from src.summarisation.service import summarize_requests
+from src.templating.render import configure_template_cache, prepare_render_data, render_newsletter
+from src.tracking.rollup import rollup_engagement
+from src.utils.http import FetchValidators, get_client
 from src.sending.gmail_send import send_message
 
 logger = logging.getLogger(__name__)
@@ -95,117 +122,286 @@ def sync_sources(config: dict) -> None:
         session.commit()
 
 
-def store_items(items: List[ItemData]) -> int:
-    inserted = 0
+def store_items(items: List[ItemData], enqueue_summaries: bool = True) -> StoreResult:
     with get_session() as session:
-        for item in items:
-            exists = (
-                session.query(Item)
-                .filter(Item.source_id == item.source_id, Item.fingerprint == item.fingerprint)
-                .first()
-            )
-            if exists:
-                continue
-            row = Item(
-                source_id=item.source_id,
-                title=item.title,
-                content_text=item.content_text,
-                url=item.url,
-                published_at=item.published_at,
-                ingested_at=item.ingested_at,
-                links=item.links,
-                fingerprint=item.fingerprint,
-            )
-            session.add(row)
-            inserted += 1
+        result = insert_items(session, items, enqueue_summaries=enqueue_summaries)
         session.commit()
-    return inserted
+    return result
 
 
-def poll_sources() -> None:
+def load_fetch_validators(source_id: str) -> FetchValidators | None:
+    with get_session() as session:
+        state = session.query(SourceFetchState).filter(SourceFetchState.source_id == source_id).first()
+        if not state:
+            return None
+        return FetchValidators(
+            etag=state.etag,
+            last_modified=state.last_modified,
+            content_length=state.content_length,
+            body_hash=state.body_hash,
+        )
+
+
+def save_fetch_validators(source_id: str, validators: FetchValidators | None) -> None:
+    if validators is None:
+        return
+    with get_session() as session:
+        state = session.query(SourceFetchState).filter(SourceFetchState.source_id == source_id).first()
+        if not state:
+            state = SourceFetchState(source_id=source_id)
+            session.add(state)
+        state.etag = validators.etag
+        state.last_modified = validators.last_modified
+        state.content_length = validators.content_length
+        state.body_hash = validators.body_hash
+        state.updated_at = datetime.utcnow()
+        session.commit()
+
+
+def save_website_state(
+    source_id: str, url: str, snapshot: WebsiteSnapshot | None, validators: FetchValidators | None
+) -> None:
+    # Recorded once the change item is stored; otherwise the next poll diffs against it and misses the change.
+    if snapshot:
+        with get_session() as session:
+            record_snapshot(session, source_id, url, snapshot)
+    save_fetch_validators(source_id, validators)
+
+
+def save_gmail_history(source_id: str, history_id: Optional[str]) -> None:
+    with get_session() as session:
+        state = session.query(GmailSyncState).filter(GmailSyncState.source_id == source_id).first()
+        if not state:
+            state = GmailSyncState(source_id=source_id)
+            session.add(state)
+        state.history_id = history_id
+        state.updated_at = datetime.utcnow()
+        session.commit()
+
+
+_source_locks: Dict[str, threading.Lock] = {}
+_source_locks_guard = threading.Lock()
+
+
+def source_poll_lock(source_id: str) -> threading.Lock:
+    with _source_locks_guard:
+        return _source_locks.setdefault(source_id, threading.Lock())
+
+
+def no_source_state() -> None:
+    return None
+
+
+def poll_source_items(source: dict, settings, finish: Callable[[str, Callable[[], None]], bool]) -> Iterator[ItemData]:
+    lock = source_poll_lock(source["source_id"])
+    if not lock.acquire(blocking=False):
+        logger.info("Source poll already running, skipping", extra={"source_id": source["source_id"]})
+        return
+    try:
+        items, save_state = fetch_source_items(source, settings)
+        yield from items
+        # Only reached once every item was handed on. The pipeline saves the
+        # source state after they are stored, so a failed store is fetched again.
+        finish(source["source_id"], partial(complete_poll, source["source_id"], save_state))
+    finally:
+        lock.release()
+
+
+def fetch_source_items(source: dict, settings) -> Tuple[Iterable[ItemData], Callable[[], None]]:
+    source_id = source["source_id"]
+    source_type = source["type"]
+    params = source.get("params", {})
+
+    if source_type == "rss":
+        items, validators = poll_rss(
+            source_id,
+            feed_url=params["feed_url"],
+            use_entry_published_date=params.get("use_entry_published_date", True),
+            validators=load_fetch_validators(source_id),
+            seen=fingerprint_index.view(source_id),
+        )
+        return items, partial(save_fetch_validators, source_id, validators)
+    if source_type == "website_change":
+        with get_session() as session:
+            previous = latest_snapshot(session, source_id)
+
+        fetch_method = params.get("fetch_method", "requests")
+        snapshot, item, validators = detect_change(
+            source_id=source_id,
+            url=params["url"],
+            fetch_method=fetch_method,
+            content_css=params["selectors"]["content_css"],
+            title_css=params["selectors"].get("title_css"),
+            remove_css=params.get("normalisation", {}).get("remove_css"),
+            strip_whitespace=params.get("normalisation", {}).get("strip_whitespace", True),
+            change_threshold_ratio=params.get("diff", {}).get("change_threshold_ratio", 0.1),
+            diff_method=params.get("diff", {}).get("method", "text"),
+            previous_snapshot=previous,
+            validators=load_fetch_validators(source_id) if fetch_method == "requests" else None,
+        )
+        return ([item] if item else []), partial(save_website_state, source_id, params["url"], snapshot, validators)
+    if source_type == "gmail_inbox":
+        if not settings.gmail_credentials_json or not settings.gmail_token_json:
+            logger.warning("Gmail credentials not configured")
+            return [], no_source_state
+        with get_session() as session:
+            state = session.query(GmailSyncState).filter(GmailSyncState.source_id == source_id).first()
+            history_id = state.history_id if state else None
+        items, history_id = poll_gmail(
+            source_id=source_id,
+            credentials_json=settings.gmail_credentials_json,
+            token_json=settings.gmail_token_json,
+            gmail_query=params["gmail_query"],
+            allowed_senders=params.get("allowed_senders"),
+            allowed_domains=params.get("allowed_domains"),
+            parse_mode=params.get("parse_mode", "html"),
+            extract_links=params.get("extract_links", True),
+            history_id=history_id,
+            known_fingerprints=fingerprint_index.view(source_id),
+        )
+        return items, partial(save_gmail_history, source_id, history_id)
+    raise ValueError(f"Unknown source type: {source_type}")
+
+
+def remember_fingerprints(items: List[ItemData]) -> None:
+    by_source: Dict[str, List[str]] = {}
+    for item in items:
+        by_source.setdefault(item.source_id, []).append(item.fingerprint)
+    for source_id, fingerprints in by_source.items():
+        fingerprint_index.add(source_id, fingerprints)
+
+
+def open_ingest_pipeline(settings) -> IngestPipeline:
+    return IngestPipeline(
+        # Without a provider nothing would ever drain the summary queue.
+        partial(store_items, enqueue_summaries=summaries_enabled(settings)),
+        on_stored=remember_fingerprints,
+        batch_size=settings.ingest_batch_size,
+        flush_seconds=settings.ingest_flush_seconds,
+        queue_size=settings.ingest_queue_size,
+    )
+
+
+def mark_source_polled(source_id: str) -> None:
+    with get_session() as session:
+        session.query(Source).filter(Source.source_id == source_id).update(
+            {Source.last_polled_at: datetime.utcnow()}, synchronize_session=False
+        )
+        session.commit()
+
+
+def complete_poll(source_id: str, save_state: Callable[[], None]) -> None:
+    save_state()
+    mark_source_polled(source_id)
+
+
+def poll_source(source_id: str) -> int:
     settings = load_settings()
     loader = ConfigLoader(settings.config_dir)
+    sources = loader.load_sources().get("sources", [])
 
-    sync_sources(loader.load_sources())
-
-    sources_config = loader.load_sources()
-    items: List[ItemData] = []
+    source = next((s for s in sources if s["source_id"] == source_id), None)
+    if not source:
+        raise ValueError(f"Source {source_id} not found")
+    if not source.get("enabled", True):
+        logger.info("Source disabled, skipping", extra={"source_id": source_id})
+        return 0
+
+    started = time.monotonic()
+    with open_ingest_pipeline(settings) as pipeline:
+        pipeline.consume(poll_source_items(source, settings, pipeline.finish))
+    counts = pipeline.counts.get(source_id, SourceCounts())
+    logger.info(
+        "Polled %s: inserted=%s skipped=%s wall=%.2fs",
+        source_id,
+        counts.inserted,
+        counts.skipped,
+        time.monotonic() - started,
+    )
+    return counts.inserted
 
-    for source in sources_config.get("sources", []):
-        if not source.get("enabled", True):
-            continue
 
-        source_id = source["source_id"]
-        source_type = source["type"]
-        params = source.get("params", {})
-
-        try:
-            if source_type == "rss":
-                items.extend(
-                    poll_rss(
-                        source_id,
-                        feed_url=params["feed_url"],
-                        use_entry_published_date=params.get("use_entry_published_date", True),
-                    )
-                )
-            elif source_type == "website_change":
-                with get_session() as session:
-                    latest = (
-                        session.query(WebsiteSnapshot)
-                        .filter(WebsiteSnapshot.source_id == source_id)
-                        .order_by(WebsiteSnapshot.created_at.desc())
-                        .first()
-                    )
-                previous = None
-                if latest:
-                    previous = SnapData(content_text=latest.content_text, content_hash=latest.content_hash)
-
-                snapshot, item = detect_change(
-                    source_id=source_id,
-                    url=params["url"],
-                    fetch_method=params.get("fetch_method", "requests"),
-                    content_css=params["selectors"]["content_css"],
-                    title_css=params["selectors"].get("title_css"),
-                    remove_css=params.get("normalisation", {}).get("remove_css"),
-                    strip_whitespace=params.get("normalisation", {}).get("strip_whitespace", True),
-                    change_threshold_ratio=params.get("diff", {}).get("change_threshold_ratio", 0.1),
-                    previous_snapshot=previous,
-                )
-                if snapshot:
-                    with get_session() as session:
-                        session.add(
-                            WebsiteSnapshot(
-                                source_id=source_id,
-                                url=params["url"],
-                                content_hash=snapshot.content_hash,
-                                content_text=snapshot.content_text,
-                            )
-                        )
-                        session.commit()
-                if item:
-                    items.append(item)
-            elif source_type == "gmail_inbox":
-                if not settings.gmail_credentials_json or not settings.gmail_token_json:
-                    logger.warning("Gmail credentials not configured")
-                    continue
-                items.extend(
-                    poll_gmail(
-                        source_id=source_id,
-                        credentials_json=settings.gmail_credentials_json,
-                        token_json=settings.gmail_token_json,
-                        gmail_query=params["gmail_query"],
-                        allowed_senders=params.get("allowed_senders"),
-                        allowed_domains=params.get("allowed_domains"),
-                        parse_mode=params.get("parse_mode", "html"),
-                        extract_links=params.get("extract_links", True),
-                    )
-                )
-        except Exception:
-            logger.exception("Failed to poll source", extra={"source_id": source_id})
+def poll_sources() -> None:
+    settings = load_settings()
+    loader = ConfigLoader(settings.config_dir)
 
-    items = dedupe_items(items)
-    inserted = store_items(items)
-    logger.info("Inserted %s items", inserted)
+    sources_config = loader.load_sources()
+    sync_sources(sources_config)
+
+    def ingest(source_id: str, items: Iterable[ItemData]) -> int:
+        return pipeline.consume(items)
+
+    started = time.monotonic()
+    pipeline = open_ingest_pipeline(settings)
+    tasks = [
+        PollTask(
+            source_id=source["source_id"],
+            host=source_host(source),
+            run=partial(poll_source_items, source, settings, pipeline.finish),
+        )
+        for source in sources_config.get("sources", [])
+        if source.get("enabled", True)
+    ]
+    try:
+        results = run_polls(
+            tasks,
+            ingest,
+            max_workers=settings.poll_max_workers,
+            per_host_limit=settings.poll_per_host_limit,
+            source_timeout=settings.poll_source_timeout_seconds,
+        )
+    finally:
+        counts = pipeline.close()
+    for result in results:
+        result.inserted = counts.get(result.source_id, SourceCounts()).inserted
+    logger.info("Ingest pipeline committed %s batches", pipeline.commits)
+    log_poll_summary(results, time.monotonic() - started)
+    get_client().log_stats()
+
+
+def summaries_enabled(settings: Settings) -> bool:
+    # Mirrors build_summary_provider without opening provider clients.
+    if settings.summary_provider == "openai":
+        return bool(settings.openai_api_key)
+    return settings.summary_provider == "ollama"
+
+
+def build_summary_provider(settings: Settings) -> Optional[RateLimitedProvider]:
+    if settings.summary_provider == "ollama":
+        limits = ProviderLimits(
+            settings.ollama_concurrency, settings.ollama_requests_per_minute, settings.ollama_tokens_per_minute
+        )
+        provider = OllamaProvider(settings.ollama_base_url, settings.ollama_model, pool_size=limits.concurrency)
+    elif settings.summary_provider == "openai" and settings.openai_api_key:
+        limits = ProviderLimits(
+            settings.openai_concurrency, settings.openai_requests_per_minute, settings.openai_tokens_per_minute
+        )
+        provider = OpenAIProvider(settings.openai_api_key, settings.openai_model, pool_size=limits.concurrency)
+    else:
+        return None
+    return RateLimitedProvider(provider, limits)
+
+
+def summarize_with_settings(
+    session,
+    settings: Settings,
+    provider: Optional[RateLimitedProvider],
+    requests: List[SummaryRequest],
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    if max_workers is None:
+        max_workers = provider.limits.concurrency if provider else 1
+    return summarize_requests(
+        session,
+        provider,
+        requests,
+        max_workers=max_workers,
+        batch_size=settings.summary_batch_size,
+        batch_tokens=settings.summary_batch_tokens,
+        budget=TokenBudget(
+            settings.summary_max_input_tokens, settings.summary_map_reduce_tokens, settings.summary_max_chunks
+        ),
+    )
 
 
 def build_newsletter(newsletter_id: str, dry_run: bool = False) -> int:
@@ -231,10 +427,14 @@ def build_newsletter(newsletter_id: str, dry_run: bool = False) -> int:
     max_items_total = selection_policy.get("max_items_total", 20)
     per_source_limit = selection_policy.get("per_source_limit")
     dedupe_across_sources = selection_policy.get("dedupe_across_sources", False)
+    near_duplicate_distance = selection_policy.get("near_duplicate_max_distance", DEFAULT_NEAR_DUPLICATE_DISTANCE)
+    engagement_weight = selection_policy.get("engagement_weight", 0.0)
+    engagement_days = selection_policy.get("engagement_days", DEFAULT_ENGAGEMENT_DAYS)
 
     source_ids = newsletter.get("sources", [])
     source_type_map = {s["source_id"]: s["type"] for s in sources_config}
-    weights = {"rss": 1.0, "website_change": 1.1, "gmail_inbox": 0.9}
+    source_weights = {s["source_id"]: s["weight"] for s in sources_config if "weight" in s}
+    ranker = build_ranker(selection_policy.get("ranker"), source_type_map, source_weights)
 
     with get_session() as session:
         items = select_items(
@@ -243,20 +443,13 @@ def build_newsletter(newsletter_id: str, dry_run: bool = False) -> int:
             window_days=window_days,
             max_items_total=max_items_total,
             per_source_limit=per_source_limit,
-            source_type_map=source_type_map,
-            weights=weights,
+            ranker=ranker,
+            dedupe_across_sources=dedupe_across_sources,
+            near_duplicate_distance=near_duplicate_distance,
+            engagement_weight=engagement_weight,
+            engagement_days=engagement_days,
         )
 
-        if dedupe_across_sources:
-            seen = set()
-            deduped = []
-            for item in items:
-                if item.fingerprint in seen:
-                    continue
-                seen.add(item.fingerprint)
-                deduped.append(item)
-            items = deduped
-
         period_end = datetime.now(timezone.utc)
         period_start = period_end - timedelta(days=window_days)
 
@@ -269,27 +462,16 @@ def build_newsletter(newsletter_id: str, dry_run: bool = False) -> int:
         session.add(run)
         session.flush()
 
-        provider = None
-        if settings.summary_provider == "ollama":
-            provider = OllamaProvider(settings.ollama_base_url, settings.ollama_model)
-        elif settings.summary_provider == "openai":
-            if settings.openai_api_key:
-                provider = OpenAIProvider(settings.openai_api_key, settings.openai_model)
+        provider = build_summary_provider(settings)
 
         summary_rules = template.get("summary_rules", {})
         max_items_rule = summary_rules.get("max_items")
         if max_items_rule:
             items = items[: max_items_rule]
 
-        for rank, item in enumerate(items, start=1):
-            req = SummaryRequest(
-                style=summary_rules.get("style", "bullets"),
-                length=summary_rules.get("length", "medium"),
-                tone=summary_rules.get("tone", "factual"),
-                language=summary_rules.get("language", "en-GB"),
-                content=item.content_text,
-            )
-            summary = provider.summarize(req) if provider else simple_summarize(req)
+        requests = [request_for_rules(summary_rules, item.content_text) for item in items]
+        summaries = summarize_with_settings(session, settings, provider, requests)
+        for rank, (item, summary) in enumerate(zip(items, summaries), start=1):
             run_item = NewsletterRunItem(
                 run_id=run.id,
                 item_id=item.id,
@@ -469,14 +651,62 @@ def send_run(run_id: int) -> None:
         session.commit()
 
 
+def polls_running() -> bool:
+    with _source_locks_guard:
+        return any(lock.locked() for lock in _source_locks.values())
+
+
+def summarise_queue() -> int:
+    # Works ahead of build_newsletter so sends mostly hit the summary cache.
+    settings = load_settings()
+    provider = build_summary_provider(settings)
+    if provider is None:
+        return 0
+    if polls_running():
+        logger.info("Summary queue skipped while sources are polling")
+        return 0
+    loader = ConfigLoader(settings.config_dir)
+    source_rules = rules_by_source(
+        loader.load_newsletters().get("newsletters", []), loader.load_templates().get("templates", [])
+    )
+    with get_session() as session:
+        processed = summarize_pending(
+            session,
+            lambda requests: summarize_with_settings(
+                session, settings, provider, requests, max_workers=settings.summary_queue_concurrency
+            ),
+            source_rules,
+            limit=settings.summary_queue_batch,
+        )
+        session.commit()
+    return processed
+
+
+def rollup() -> None:
+    with get_session() as session:
+        rollup_engagement(session)
+        session.commit()
+
+
 def prune() -> None:
     settings = load_settings()
     cutoff = datetime.now(timezone.utc) - timedelta(days=settings.retention_days)
     with get_session() as session:
         session.execute(delete(Event).where(Event.timestamp < cutoff))
-        session.execute(delete(WebsiteSnapshot).where(WebsiteSnapshot.created_at < cutoff))
+        prune_snapshots(session, cutoff)
+        session.execute(
+            delete(ItemSignature).where(
+                ItemSignature.item_id.in_(select(Item.id).where(Item.ingested_at < cutoff))
+            )
+        )
+        session.execute(delete(ItemCandidate).where(ItemCandidate.ingested_at < cutoff))
+        session.execute(
+            delete(SummaryJob).where(SummaryJob.item_id.in_(select(Item.id).where(Item.ingested_at < cutoff)))
+        )
         session.execute(delete(Item).where(Item.ingested_at < cutoff))
+        evict_summaries(session, settings.summary_cache_days, settings.summary_cache_max_entries)
         session.commit()
+    fingerprint_index.invalidate()
 
 
 def report(newsletter_id: str, days: int) -> None:
@@ -498,6 +728,32 @@ def report(newsletter_id: str, days: int) -> None:
             print(f"Clicks: {clicks}")
 
 
+def add_poll_jobs(
+    scheduler, sources: List[dict], last_polled: Dict[str, Optional[datetime]], now: datetime, jitter_seconds: int
+) -> None:
+    for source in sources:
+        if not source.get("enabled", True):
+            continue
+        source_id = source["source_id"]
+        interval_minutes = source.get("poll_interval_minutes", 60)
+        interval = timedelta(minutes=interval_minutes)
+        due = now
+        if last_polled.get(source_id):
+            due = max(now, last_polled[source_id].replace(tzinfo=timezone.utc) + interval)
+        first_run = due + timedelta(seconds=random.uniform(0, jitter_seconds))
+        scheduler.add_job(
+            poll_source,
+            "interval",
+            args=[source_id],
+            id=f"poll-source:{source_id}",
+            minutes=interval_minutes,
+            next_run_time=first_run,
+            jitter=jitter_seconds,
+            max_instances=1,
+            coalesce=True,
+        )
+
+
 def run_scheduler() -> None:
     from apscheduler.schedulers.background import BackgroundScheduler
 
@@ -508,11 +764,10 @@ def run_scheduler() -> None:
 
     scheduler = BackgroundScheduler(timezone=settings.timezone)
 
-    for source in sources:
-        if not source.get("enabled", True):
-            continue
-        interval = source.get("poll_interval_minutes", 60)
-        scheduler.add_job(poll_sources, "interval", minutes=interval)
+    sync_sources({"sources": sources})
+    with get_session() as session:
+        last_polled = {row.source_id: row.last_polled_at for row in session.query(Source).all()}
+    add_poll_jobs(scheduler, sources, last_polled, datetime.now(timezone.utc), settings.poll_jitter_seconds)
 
     def schedule_newsletters():
         now = datetime.now(timezone.utc)
@@ -554,29 +809,88 @@ def run_scheduler() -> None:
 
     scheduler.add_job(schedule_newsletters, "interval", minutes=1)
     scheduler.add_job(prune, "interval", hours=24)
+    scheduler.add_job(rollup, "interval", minutes=settings.engagement_rollup_minutes, max_instances=1, coalesce=True)
+    if summaries_enabled(settings):
+        scheduler.add_job(
+            summarise_queue, "interval", minutes=settings.summary_queue_minutes, max_instances=1, coalesce=True
+        )
 
     scheduler.start()
     logger.info("Scheduler started")
 
     try:
         while True:
-            import time
-
             time.sleep(5)
     except KeyboardInterrupt:
         scheduler.shutdown()
 
 
+def hot_queries() -> list:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+    return [
+        (
+            "selection candidates",
+            candidate_query(["source"], cutoff, 10, TimestampRanker().source_order(["source"])),
+        ),
+        (
+            "run items by rank",
+            select(NewsletterRunItem).where(NewsletterRunItem.run_id == 1).order_by(NewsletterRunItem.rank.asc()),
+        ),
+        (
+            "failed sends per recipient",
+            select(func.count())
+            .select_from(EmailSent)
+            .where(EmailSent.recipient_email == "user@example.com", EmailSent.status == "failed"),
+        ),
+        (
+            "report events",
+            select(func.count()).select_from(Event).where(Event.type == "open", Event.timestamp >= cutoff),
+        ),
+        ("events per email", select(Event).where(Event.email_id == 1)),
+        (
+            "latest snapshot",
+            select(SnapshotSighting)
+            .where(SnapshotSighting.source_id == "source")
+            .order_by(SnapshotSighting.created_at.desc())
+            .limit(1),
+        ),
+    ]
+
+
+def migrate(show_explain: bool = False) -> None:
+    engine = get_engine()
+    run_migrations(engine)
+    with engine.connect() as connection:
+        applied = set(applied_versions(connection))
+        for migration in MIGRATIONS:
+            status = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version:>4} {status:<8} {migration.name}")
+        if show_explain:
+            for name, statement in hot_queries():
+                print(f"\n{name}:")
+                for line in explain(connection, statement):
+                    print(f"  {line}")
+
+
 def main() -> None:
     configure_logging()
     settings = load_settings()
     init_engine(settings.db_url)
+    configure_browser_pool(
+        max_pages=settings.playwright_max_pages,
+        block_resources=settings.playwright_block_resources,
+        recycle_after=settings.playwright_recycle_after,
+    )
+    configure_template_cache(settings.template_cache_dir)
 
     parser = argparse.ArgumentParser()
     sub = parser.add_subparsers(dest="command", required=True)
 
     sub.add_parser("poll-sources")
 
+    poll_cmd = sub.add_parser("poll-source")
+    poll_cmd.add_argument("--source-id", required=True)
+
     build_cmd = sub.add_parser("build-newsletter")
     build_cmd.add_argument("--newsletter-id", required=True)
     build_cmd.add_argument("--dry-run", action="store_true")
@@ -586,6 +900,11 @@ def main() -> None:
 
     sub.add_parser("run-scheduler")
     sub.add_parser("prune")
+    sub.add_parser("rollup-engagement")
+    sub.add_parser("summarise-queue")
+
+    migrate_cmd = sub.add_parser("migrate")
+    migrate_cmd.add_argument("--explain", action="store_true")
 
     report_cmd = sub.add_parser("report")
     report_cmd.add_argument("--newsletter-id", required=True)
@@ -595,6 +914,8 @@ def main() -> None:
 
     if args.command == "poll-sources":
         poll_sources()
+    elif args.command == "poll-source":
+        poll_source(args.source_id)
     elif args.command == "build-newsletter":
         run_id = build_newsletter(args.newsletter_id, dry_run=args.dry_run)
         print(f"Run id: {run_id}")
@@ -604,6 +925,12 @@ def main() -> None:
         run_scheduler()
     elif args.command == "prune":
         prune()
+    elif args.command == "rollup-engagement":
+        rollup()
+    elif args.command == "summarise-queue":
+        print(f"Summarised: {summarise_queue()} items")
+    elif args.command == "migrate":
+        migrate(show_explain=args.explain)
     elif args.command == "report":
         report(args.newsletter_id, args.days)
 
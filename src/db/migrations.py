@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Sequence
+
+from sqlalchemy import Column, func, insert, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateColumn
+
+from src.db.models import UNDATED, Item, ItemCandidate, SchemaMigration
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN", "postgresql": "EXPLAIN"}
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def create_index(connection: Connection, name: str, table: str, columns: Sequence[str]) -> None:
+    connection.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+
+def add_column(connection: Connection, table: str, column: Column) -> None:
+    existing = {c["name"] for c in inspect(connection).get_columns(table)}
+    if column.name in existing:
+        return
+    spec = CreateColumn(column).compile(dialect=connection.dialect)
+    connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {spec}")
+
+
+def hot_query_indexes(connection: Connection) -> None:
+    create_index(connection, "ix_items_source_ingested", "items", ["source_id", "ingested_at"])
+    create_index(connection, "ix_newsletter_run_items_run_rank", "newsletter_run_items", ["run_id", "rank"])
+    create_index(connection, "ix_events_type_timestamp", "events", ["type", "timestamp"])
+    create_index(connection, "ix_events_email_id", "events", ["email_id"])
+    create_index(connection, "ix_emails_sent_recipient_status", "emails_sent", ["recipient_email", "status"])
+    create_index(connection, "ix_website_snapshots_source_created", "website_snapshots", ["source_id", "created_at"])
+    create_index(connection, "ix_snapshot_sightings_source_created", "snapshot_sightings", ["source_id", "created_at"])
+
+
+def backfill_item_candidates(connection: Connection) -> None:
+    done = select(ItemCandidate.item_id)
+    rows = select(
+        Item.id,
+        Item.source_id,
+        Item.published_at,
+        Item.ingested_at,
+        func.coalesce(Item.published_at, UNDATED),
+        func.coalesce(Item.published_at, Item.ingested_at),
+        Item.fingerprint,
+    ).where(Item.id.not_in(done))
+    columns = ["item_id", "source_id", "published_at", "ingested_at", "published_key", "rank_time", "fingerprint"]
+    connection.execute(insert(ItemCandidate).from_select(columns, rows))
+
+
+# Append only. Each step must also be reflected in models.py so fresh
+# databases built by create_all end up with the same schema.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "hot query indexes", hot_query_indexes),
+    Migration(2, "backfill item candidates", backfill_item_candidates),
+]
+
+
+def applied_versions(connection: Connection) -> List[int]:
+    return list(connection.execute(select(SchemaMigration.version).order_by(SchemaMigration.version)).scalars())
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    with engine.connect() as connection:
+        applied = set(applied_versions(connection))
+    return [m for m in MIGRATIONS if m.version not in applied]
+
+
+def run_migrations(engine: Engine) -> List[Migration]:
+    applied: List[Migration] = []
+    for migration in pending_migrations(engine):
+        try:
+            with engine.begin() as connection:
+                migration.apply(connection)
+                connection.execute(
+                    SchemaMigration.__table__.insert().values(
+                        version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+                    )
+                )
+        except IntegrityError:
+            logger.info("Migration %s already applied by another process", migration.version)
+            continue
+        logger.info("Applied migration %s: %s", migration.version, migration.name)
+        applied.append(migration)
+    return applied
+
+
+def explain(connection: Connection, statement) -> List[str]:
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    prefix = EXPLAIN_PREFIX.get(connection.dialect.name, "EXPLAIN")
+    rows = connection.exec_driver_sql(f"{prefix} {compiled}", params).all()
+    return [" ".join(str(value) for value in row) for row in rows]
@@ -4,11 +4,14 @@ from datetime import datetime
 from sqlalchemy import (
     Boolean,
     Column,
+    Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     JSON,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -68,6 +71,27 @@ class Source(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+class SourceFetchState(Base):
+    __tablename__ = "source_fetch_state"
+
+    id = Column(Integer, primary_key=True)
+    source_id = Column(String(128), unique=True, nullable=False, index=True)
+    etag = Column(String(512))
+    last_modified = Column(String(128))
+    content_length = Column(Integer)
+    body_hash = Column(String(64))
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class GmailSyncState(Base):
+    __tablename__ = "gmail_sync_state"
+
+    id = Column(Integer, primary_key=True)
+    source_id = Column(String(128), unique=True, nullable=False, index=True)
+    history_id = Column(String(32))
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class Item(Base):
     __tablename__ = "items"
 
@@ -81,7 +105,42 @@ class Item(Base):
     links = Column(JSON)
     fingerprint = Column(String(64), nullable=False, index=True)
 
-    __table_args__ = (UniqueConstraint("source_id", "fingerprint", name="uq_item_source_fingerprint"),)
+    __table_args__ = (
+        UniqueConstraint("source_id", "fingerprint", name="uq_item_source_fingerprint"),
+        Index("ix_items_source_ingested", "source_id", "ingested_at"),
+    )
+
+
+class ItemSignature(Base):
+    __tablename__ = "item_signatures"
+
+    id = Column(Integer, primary_key=True)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False, unique=True)
+    simhash = Column(String(16), nullable=False)
+
+
+# Sort key for candidates without published_at; they score 0 and rank last.
+UNDATED = datetime(1970, 1, 1)
+
+
+class ItemCandidate(Base):
+    __tablename__ = "item_candidates"
+
+    id = Column(Integer, primary_key=True)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False, unique=True)
+    source_id = Column(String(128), nullable=False)
+    published_at = Column(DateTime)
+    ingested_at = Column(DateTime, nullable=False)
+    # Non-null sort keys so per-source top-K reads walk an index without sorting.
+    published_key = Column(DateTime, nullable=False)
+    rank_time = Column(DateTime, nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+
+    __table_args__ = (
+        Index("ix_item_candidates_source_published", "source_id", "published_key", "item_id"),
+        Index("ix_item_candidates_source_rank_time", "source_id", "rank_time", "item_id"),
+        Index("ix_item_candidates_ingested", "ingested_at"),
+    )
 
 
 class WebsiteSnapshot(Base):
@@ -94,6 +153,31 @@ class WebsiteSnapshot(Base):
     content_text = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (Index("ix_website_snapshots_source_created", "source_id", "created_at"),)
+
+
+class SnapshotContent(Base):
+    __tablename__ = "snapshot_contents"
+
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), unique=True, nullable=False, index=True)
+    compression = Column(String(16), nullable=False, default="zlib")
+    content_blob = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SnapshotSighting(Base):
+    __tablename__ = "snapshot_sightings"
+
+    id = Column(Integer, primary_key=True)
+    source_id = Column(String(128), nullable=False, index=True)
+    url = Column(String(2048), nullable=False)
+    content_hash = Column(String(64), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (Index("ix_snapshot_sightings_source_created", "source_id", "created_at"),)
+
 
 class NewsletterRun(Base):
     __tablename__ = "newsletter_runs"
@@ -120,7 +204,10 @@ class NewsletterRunItem(Base):
 
     run = relationship("NewsletterRun", back_populates="items")
 
-    __table_args__ = (UniqueConstraint("run_id", "item_id", name="uq_run_item"),)
+    __table_args__ = (
+        UniqueConstraint("run_id", "item_id", name="uq_run_item"),
+        Index("ix_newsletter_run_items_run_rank", "run_id", "rank"),
+    )
 
 
 class EmailSent(Base):
@@ -134,14 +221,73 @@ class EmailSent(Base):
     error = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    __table_args__ = (UniqueConstraint("run_id", "recipient_email", name="uq_run_recipient"),)
+    __table_args__ = (
+        UniqueConstraint("run_id", "recipient_email", name="uq_run_recipient"),
+        Index("ix_emails_sent_recipient_status", "recipient_email", "status"),
+    )
 
 
 class Event(Base):
     __tablename__ = "events"
 
     id = Column(Integer, primary_key=True)
-    email_id = Column(Integer, ForeignKey("emails_sent.id"), nullable=False)
+    email_id = Column(Integer, ForeignKey("emails_sent.id"), nullable=False, index=True)
     type = Column(String(32), nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     link_url = Column(String(2048))
+
+    __table_args__ = (Index("ix_events_type_timestamp", "type", "timestamp"),)
+
+
+class EngagementDaily(Base):
+    __tablename__ = "engagement_daily"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    dimension = Column(String(16), nullable=False)
+    key = Column(String(255), nullable=False)
+    sends = Column(Integer, nullable=False, default=0)
+    opens = Column(Integer, nullable=False, default=0)
+    clicks = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("day", "dimension", "key", name="uq_engagement_day_key"),
+        Index("ix_engagement_daily_dimension_day", "dimension", "day"),
+    )
+
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(64), unique=True, nullable=False)
+    position = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SummaryJob(Base):
+    __tablename__ = "summary_jobs"
+
+    id = Column(Integer, primary_key=True)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SummaryCacheEntry(Base):
+    __tablename__ = "summary_cache"
+
+    id = Column(Integer, primary_key=True)
+    key = Column(String(64), unique=True, nullable=False)
+    provider = Column(String(128), nullable=False)
+    summary = Column(Text, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
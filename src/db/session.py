@@ -3,6 +3,7 @@ from __future__ import annotations
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from src.db.migrations import run_migrations
 from src.db.models import Base
 
 
@@ -19,6 +20,13 @@ def init_engine(db_url: str) -> None:
         _engine = create_engine(db_url, future=True, connect_args=connect_args)
         _SessionLocal = sessionmaker(bind=_engine, autoflush=False, autocommit=False, future=True)
         Base.metadata.create_all(bind=_engine)
+        run_migrations(_engine)
+
+
+def get_engine():
+    if _engine is None:
+        raise RuntimeError("DB engine not initialized")
+    return _engine
 
 
 def get_session():
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+
+class _BrowserSlot:
+    def __init__(self, browser, context) -> None:
+        self.browser = browser
+        self.context = context
+        self.served = 0
+        self.active = 0
+
+    async def close(self) -> None:
+        try:
+            await self.context.close()
+            await self.browser.close()
+        except Exception:
+            logger.debug("Browser already closed", exc_info=True)
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        max_pages: int = 2,
+        block_resources: bool = True,
+        recycle_after: int = 100,
+        navigation_timeout: float = 30.0,
+    ) -> None:
+        self.max_pages = max_pages
+        self.block_resources = block_resources
+        self.recycle_after = recycle_after
+        self.navigation_timeout = navigation_timeout
+        self.launches = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._current: Optional[_BrowserSlot] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+
+    def fetch(self, url: str) -> str:
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._fetch(url), loop)
+        return future.result(timeout=self.navigation_timeout + 30)
+
+    def close(self) -> None:
+        with self._start_lock:
+            if self._loop is None:
+                return
+            loop, thread = self._loop, self._thread
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=30)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=10)
+            loop.close()
+            self._loop = None
+            self._thread = None
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                try:
+                    from playwright.async_api import async_playwright
+                except ImportError as exc:
+                    raise RuntimeError("Playwright not installed") from exc
+
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+                thread.start()
+                asyncio.run_coroutine_threadsafe(self._startup(async_playwright), loop).result(timeout=60)
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    async def _startup(self, async_playwright) -> None:
+        self._semaphore = asyncio.Semaphore(self.max_pages)
+        self._launch_lock = asyncio.Lock()
+        self._playwright = await async_playwright().start()
+
+    async def _shutdown(self) -> None:
+        if self._current:
+            await self._current.close()
+            self._current = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _launch(self) -> _BrowserSlot:
+        browser = await self._playwright.chromium.launch()
+        context = await browser.new_context()
+        if self.block_resources:
+            await context.route("**/*", self._route)
+        self.launches += 1
+        logger.info("Launched pooled browser (launch %s)", self.launches)
+        return _BrowserSlot(browser, context)
+
+    async def _route(self, route) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire_slot(self) -> _BrowserSlot:
+        async with self._launch_lock:
+            current = self._current
+            if current is None or current.served >= self.recycle_after or not current.browser.is_connected():
+                self._current = await self._launch()
+                # A retired browser is closed once its last in-flight page finishes.
+                if current is not None and current.active == 0:
+                    await current.close()
+            slot = self._current
+            slot.served += 1
+            slot.active += 1
+            return slot
+
+    async def _fetch(self, url: str) -> str:
+        async with self._semaphore:
+            slot = await self._acquire_slot()
+            try:
+                page = await slot.context.new_page()
+                try:
+                    await page.goto(url, wait_until="networkidle", timeout=self.navigation_timeout * 1000)
+                    return await page.content()
+                finally:
+                    await page.close()
+            finally:
+                slot.active -= 1
+                if slot is not self._current and slot.active == 0:
+                    await slot.close()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def configure_browser_pool(max_pages: int, block_resources: bool, recycle_after: int) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = BrowserPool(max_pages=max_pages, block_resources=block_resources, recycle_after=recycle_after)
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+
+def close_browser_pool() -> None:
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+
+
+atexit.register(close_browser_pool)
@@ -2,19 +2,23 @@ from __future__ import annotations
 
 import base64
 import logging
-from typing import List, Optional
+from typing import Container, Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 
-from src.ingestion.normalise import extract_links_from_html, normalise_from_gmail
+from src.ingestion.html_extract import extract_html
+from src.ingestion.normalise import ItemData, normalise_from_gmail
+from src.utils.hashing import sha256_text
 
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
+BATCH_SIZE = 50
+METADATA_HEADERS = ["From", "Subject"]
 
 
 def load_credentials(credentials_json: str, token_json: str) -> Credentials:
@@ -54,44 +58,193 @@ def decode_body(part: dict) -> str:
     return data.decode("utf-8", errors="ignore")
 
 
-def poll_gmail(
+def sender_allowed(
+    from_header: str,
+    allowed_senders: Optional[List[str]],
+    allowed_domains: Optional[List[str]],
+) -> bool:
+    if allowed_senders and not any(sender in from_header for sender in allowed_senders):
+        return False
+    if allowed_domains and not any(domain in from_header for domain in allowed_domains):
+        return False
+    return True
+
+
+def header_map(msg: dict) -> Dict[str, str]:
+    headers = msg.get("payload", {}).get("headers", [])
+    return {h["name"].lower(): h["value"] for h in headers}
+
+
+def list_message_ids(service, gmail_query: str) -> List[str]:
+    ids: List[str] = []
+    page_token = None
+    while True:
+        kwargs = {"userId": "me", "q": gmail_query}
+        if page_token:
+            kwargs["pageToken"] = page_token
+        response = service.users().messages().list(**kwargs).execute()
+        ids.extend(message["id"] for message in response.get("messages", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return ids
+
+
+def list_history_message_ids(service, start_history_id: str) -> List[str]:
+    ids: List[str] = []
+    page_token = None
+    while True:
+        kwargs = {"userId": "me", "startHistoryId": start_history_id, "historyTypes": ["messageAdded"]}
+        if page_token:
+            kwargs["pageToken"] = page_token
+        response = service.users().history().list(**kwargs).execute()
+        for record in response.get("history", []):
+            for added in record.get("messagesAdded", []):
+                ids.append(added["message"]["id"])
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return list(dict.fromkeys(ids))
+
+
+def batch_get_messages(service, message_ids: List[str], fmt: str, **kwargs) -> Tuple[Dict[str, dict], List[str]]:
+    # Returns the messages and the ids that could not be fetched. Deleted messages are neither.
+    results: Dict[str, dict] = {}
+    failed: List[str] = []
+    unavailable: List[str] = []
+
+    def callback(request_id, response, exception):
+        if exception is not None:
+            failed.append(request_id)
+        else:
+            results[request_id] = response
+
+    for start in range(0, len(message_ids), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=callback)
+        for message_id in message_ids[start : start + BATCH_SIZE]:
+            batch.add(
+                service.users().messages().get(userId="me", id=message_id, format=fmt, **kwargs),
+                request_id=message_id,
+            )
+        batch.execute()
+
+    # Batched calls can be rejected individually (e.g. rate limits); retry those one by one.
+    for message_id in failed:
+        try:
+            results[message_id] = (
+                service.users().messages().get(userId="me", id=message_id, format=fmt, **kwargs).execute()
+            )
+        except HttpError as exc:
+            if exc.resp.status == 404:
+                continue
+            logger.exception("Failed to fetch Gmail message", extra={"message_id": message_id})
+            unavailable.append(message_id)
+    return results, unavailable
+
+
+def sync_gmail(
+    service,
     source_id: str,
-    credentials_json: str,
-    token_json: str,
     gmail_query: str,
     allowed_senders: Optional[List[str]],
     allowed_domains: Optional[List[str]],
     parse_mode: str,
     extract_links: bool,
-) -> List:
-    creds = load_credentials(credentials_json, token_json)
-    service = build("gmail", "v1", credentials=creds)
-
-    response = service.users().messages().list(userId="me", q=gmail_query).execute()
-    messages = response.get("messages", [])
+    history_id: Optional[str] = None,
+    known_fingerprints: Optional[Container[str]] = None,
+) -> tuple[List[ItemData], Optional[str]]:
+    latest_history_id = str(service.users().getProfile(userId="me").execute()["historyId"])
+
+    candidates = None
+    if history_id:
+        try:
+            candidates = list_history_message_ids(service, history_id)
+        except HttpError as exc:
+            if exc.resp.status != 404:
+                raise
+            logger.info("Gmail history expired, running full sync", extra={"source_id": source_id})
+
+    message_ids = list_message_ids(service, gmail_query) if candidates is None else candidates
+    if known_fingerprints is not None:
+        message_ids = [m for m in message_ids if sha256_text(m) not in known_fingerprints]
+
+    metadata: Dict[str, dict] = {}
+    unavailable: List[str] = []
+    if candidates is not None and message_ids:
+        # History is not filtered by the query. Listing what it matches since the oldest
+        # new message keeps that check about as small as the history itself.
+        metadata, unavailable = batch_get_messages(service, message_ids, "metadata", metadataHeaders=METADATA_HEADERS)
+        matched = set()
+        if metadata:
+            oldest = min(int(m.get("internalDate", 0)) for m in metadata.values()) // 1000
+            matched.update(list_message_ids(service, f"({gmail_query}) after:{oldest - 1}"))
+        message_ids = [m for m in message_ids if m in matched]
+
+    if message_ids and (allowed_senders or allowed_domains):
+        missing = [m for m in message_ids if m not in metadata]
+        if missing:
+            fetched, failed = batch_get_messages(service, missing, "metadata", metadataHeaders=METADATA_HEADERS)
+            metadata.update(fetched)
+            unavailable.extend(failed)
+        message_ids = [
+            m
+            for m in message_ids
+            if m in metadata
+            and sender_allowed(header_map(metadata[m]).get("from", ""), allowed_senders, allowed_domains)
+        ]
+
+    messages: Dict[str, dict] = {}
+    if message_ids:
+        messages, failed = batch_get_messages(service, message_ids, "full")
+        unavailable.extend(failed)
 
     items = []
-    for message in messages:
-        msg = service.users().messages().get(userId="me", id=message["id"], format="full").execute()
-        headers = msg.get("payload", {}).get("headers", [])
-        header_map = {h["name"].lower(): h["value"] for h in headers}
-        from_header = header_map.get("from", "")
-        subject = header_map.get("subject", "(no subject)")
-
-        if allowed_senders and not any(sender in from_header for sender in allowed_senders):
-            continue
-        if allowed_domains and not any(domain in from_header for domain in allowed_domains):
+    for message_id in message_ids:
+        msg = messages.get(message_id)
+        if not msg:
             continue
+        subject = header_map(msg).get("subject", "(no subject)")
 
         body = get_message_body(msg.get("payload", {}), parse_mode=parse_mode)
         if parse_mode == "html":
-            soup = BeautifulSoup(body, "html.parser")
-            text_body = " ".join(soup.get_text(" ").split())
-            links = extract_links_from_html(body) if extract_links else []
+            parsed = extract_html(body)
+            text_body = parsed.text
+            links = parsed.links if extract_links else []
         else:
             text_body = " ".join(body.split())
             links = []
 
         items.append(normalise_from_gmail(source_id, subject, text_body, links, msg.get("id", "")))
 
-    return items
+    if unavailable:
+        # Sync again from the previous point next time; fetched messages are skipped by fingerprint.
+        logger.warning(
+            "Could not fetch %s Gmail messages, keeping history id", len(unavailable), extra={"source_id": source_id}
+        )
+        return items, history_id
+    return items, latest_history_id
+
+
+def poll_gmail(
+    source_id: str,
+    credentials_json: str,
+    token_json: str,
+    gmail_query: str,
+    allowed_senders: Optional[List[str]],
+    allowed_domains: Optional[List[str]],
+    parse_mode: str,
+    extract_links: bool,
+    history_id: Optional[str] = None,
+    known_fingerprints: Optional[Container[str]] = None,
+) -> tuple[List[ItemData], Optional[str]]:
+    creds = load_credentials(credentials_json, token_json)
+    service = build("gmail", "v1", credentials=creds)
+    return sync_gmail(
+        service,
+        source_id=source_id,
+        gmail_query=gmail_query,
+        allowed_senders=allowed_senders,
+        allowed_domains=allowed_domains,
+        parse_mode=parse_mode,
+        extract_links=extract_links,
+        history_id=history_id,
+        known_fingerprints=known_fingerprints,
+    )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+from bs4 import CData, NavigableString, Tag
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+SKIP_TAGS = {"script", "style", "template"}
+PARSER = "lxml" if etree is not None else "html.parser"
+
+
+@dataclass
+class ExtractedHtml:
+    title: str
+    text: str
+    links: List[str] = field(default_factory=list)
+
+
+def clean_text(text: str, strip_whitespace: bool = True) -> str:
+    if strip_whitespace:
+        return " ".join(text.split())
+    return text
+
+
+class _Collector:
+    def __init__(self) -> None:
+        self.chunks: List[str] = []
+        self.title_chunks: List[str] = []
+        self.links: Dict[str, None] = {}
+        self.skip_depth = 0
+        self.in_title = False
+
+    def start(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+        tag = tag.lower()
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "title":
+            self.in_title = True
+        elif tag == "a":
+            href = attrs.get("href")
+            if href:
+                self.links[href] = None
+
+    def end(self, tag: str) -> None:
+        tag = tag.lower()
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag == "title":
+            self.in_title = False
+
+    def data(self, text: str) -> None:
+        if self.skip_depth:
+            return
+        self.chunks.append(text)
+        if self.in_title:
+            self.title_chunks.append(text)
+
+    def close(self) -> "_Collector":
+        return self
+
+    def result(self, strip_whitespace: bool) -> ExtractedHtml:
+        return ExtractedHtml(
+            title=clean_text(" ".join(self.title_chunks), strip_whitespace),
+            text=clean_text(" ".join(self.chunks), strip_whitespace),
+            links=list(self.links),
+        )
+
+
+class _StdlibParser(HTMLParser):
+    def __init__(self, collector: _Collector) -> None:
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+        self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+def extract_html(html: str, strip_whitespace: bool = True) -> ExtractedHtml:
+    collector = _Collector()
+    if not html:
+        return collector.result(strip_whitespace)
+    if etree is not None:
+        parser = etree.HTMLParser(target=collector, recover=True)
+        parser.feed(html)
+        parser.close()
+    else:
+        parser = _StdlibParser(collector)
+        parser.feed(html)
+        parser.close()
+    return collector.result(strip_whitespace)
+
+
+def element_text_and_links(element: Tag, strip_whitespace: bool = True) -> tuple[str, List[str]]:
+    chunks: List[str] = []
+    links: Dict[str, None] = {}
+    for node in element.descendants:
+        if isinstance(node, Tag):
+            if node.name == "a":
+                href = node.get("href")
+                if href:
+                    links[href] = None
+        elif type(node) in (NavigableString, CData):
+            chunks.append(node)
+    return clean_text(" ".join(chunks), strip_whitespace), list(links)
@@ -4,8 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from bs4 import BeautifulSoup
-
+from src.ingestion.html_extract import clean_text, extract_html
 from src.utils.hashing import sha256_text
 from src.utils.time import safe_datetime
 
@@ -22,34 +21,31 @@ class ItemData:
     fingerprint: str
 
 
-def clean_text(text: str, strip_whitespace: bool = True) -> str:
-    if strip_whitespace:
-        return " ".join(text.split())
-    return text
+def extract_links_from_html(html: str) -> List[str]:
+    return extract_html(html).links
 
 
-def extract_links_from_html(html: str) -> List[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    links = []
-    for link in soup.find_all("a"):
-        href = link.get("href")
-        if href:
-            links.append(href)
-    return list(dict.fromkeys(links))
+def rss_entry_content(entry: dict) -> str:
+    if entry.get("content"):
+        return entry["content"][0].get("value", "")
+    if entry.get("summary"):
+        return entry.get("summary", "")
+    return ""
+
+
+def rss_fingerprint(entry: dict) -> str:
+    url = entry.get("link")
+    return sha256_text(url or f"{entry.get('title', '')}:{rss_entry_content(entry)[:500]}")
 
 
 def normalise_from_rss(source_id: str, entry: dict, use_entry_published_date: bool) -> ItemData:
     title = entry.get("title", "")
     url = entry.get("link")
-    content = ""
-    if entry.get("content"):
-        content = entry["content"][0].get("value", "")
-    elif entry.get("summary"):
-        content = entry.get("summary", "")
+    content = rss_entry_content(entry)
 
-    links = extract_links_from_html(content)
-    soup = BeautifulSoup(content, "html.parser")
-    content_text = clean_text(soup.get_text(" "))
+    parsed = extract_html(content)
+    links = parsed.links
+    content_text = parsed.text
 
     published_at = None
     if use_entry_published_date:
@@ -57,8 +53,6 @@ def normalise_from_rss(source_id: str, entry: dict, use_entry_published_date: bo
         if published_at:
             published_at = datetime(*published_at[:6], tzinfo=timezone.utc)
 
-    fingerprint = sha256_text(url or f"{title}:{content_text[:500]}")
-
     return ItemData(
         source_id=source_id,
         title=title,
@@ -67,7 +61,7 @@ def normalise_from_rss(source_id: str, entry: dict, use_entry_published_date: bo
         published_at=published_at,
         ingested_at=safe_datetime(None),
         links=links,
-        fingerprint=fingerprint,
+        fingerprint=rss_fingerprint(entry),
     )
 
 
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.ingestion.normalise import ItemData
+from src.ingestion.store import StoreResult
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class _SourceDone:
+    source_id: str
+    on_complete: Callable[[], None]
+
+
+@dataclass
+class SourceCounts:
+    submitted: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+class IngestPipeline:
+    def __init__(
+        self,
+        store_batch: Callable[[List[ItemData]], StoreResult],
+        on_stored: Optional[Callable[[List[ItemData]], None]] = None,
+        batch_size: int = 500,
+        flush_seconds: float = 5.0,
+        queue_size: int = 1000,
+    ) -> None:
+        self.store_batch = store_batch
+        self.on_stored = on_stored
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.counts: Dict[str, SourceCounts] = {}
+        self.commits = 0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._counts_lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="ingest-writer", daemon=True)
+        self._writer.start()
+
+    def consume(self, items: Iterable[ItemData]) -> int:
+        submitted = 0
+        for item in items:
+            if not self.submit(item):
+                break
+            submitted += 1
+        return submitted
+
+    def submit(self, item: ItemData) -> bool:
+        if not self._put(item):
+            return False
+        with self._counts_lock:
+            self._source_counts(item.source_id).submitted += 1
+        return True
+
+    def finish(self, source_id: str, on_complete: Callable[[], None]) -> bool:
+        # on_complete runs on the writer thread once everything submitted for the
+        # source so far is stored, and not at all if any of it failed to store.
+        return self._put(_SourceDone(source_id, on_complete))
+
+    def _put(self, entry) -> bool:
+        # Blocks while the writer is behind, which keeps memory bounded.
+        while True:
+            if self._closed:
+                return False
+            try:
+                self._queue.put(entry, timeout=1.0)
+                return True
+            except queue.Full:
+                continue
+
+    def close(self) -> Dict[str, SourceCounts]:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._writer.join()
+        return self.counts
+
+    def __enter__(self) -> "IngestPipeline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _source_counts(self, source_id: str) -> SourceCounts:
+        return self.counts.setdefault(source_id, SourceCounts())
+
+    def _run(self) -> None:
+        batch: List[ItemData] = []
+        keys: Set[Tuple[str, str]] = set()
+        done: List[_SourceDone] = []
+        deadline = time.monotonic() + self.flush_seconds
+        while True:
+            try:
+                entry = self._queue.get(timeout=max(deadline - time.monotonic(), 0.01))
+            except queue.Empty:
+                entry = None
+
+            if entry is _STOP:
+                self._flush(batch)
+                self._complete(done)
+                return
+            if isinstance(entry, _SourceDone):
+                done.append(entry)
+            elif entry is not None:
+                key = (entry.source_id, entry.fingerprint)
+                if key in keys:
+                    with self._counts_lock:
+                        self._source_counts(entry.source_id).skipped += 1
+                else:
+                    keys.add(key)
+                    batch.append(entry)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                self._complete(done)
+                batch = []
+                keys = set()
+                done = []
+                deadline = time.monotonic() + self.flush_seconds
+
+    def _flush(self, batch: List[ItemData]) -> None:
+        if not batch:
+            return
+        try:
+            result = self.store_batch(batch)
+        except Exception:
+            by_source: Dict[str, List[ItemData]] = {}
+            for item in batch:
+                by_source.setdefault(item.source_id, []).append(item)
+            if len(by_source) > 1:
+                # One bad source should not fail the others sharing its batch.
+                logger.warning("Retrying ingest batch of %s items per source", len(batch), exc_info=True)
+                for items in by_source.values():
+                    self._flush(items)
+                return
+            logger.exception("Failed to store ingest batch of %s items", len(batch))
+            with self._counts_lock:
+                for item in batch:
+                    self._source_counts(item.source_id).failed += 1
+            return
+
+        self.commits += 1
+        batch_per_source: Dict[str, int] = {}
+        for item in batch:
+            batch_per_source[item.source_id] = batch_per_source.get(item.source_id, 0) + 1
+        with self._counts_lock:
+            for source_id, count in batch_per_source.items():
+                counts = self._source_counts(source_id)
+                inserted = result.inserted_by_source.get(source_id, 0)
+                counts.inserted += inserted
+                counts.skipped += count - inserted
+        if self.on_stored:
+            self.on_stored(batch)
+
+    def _complete(self, done: List[_SourceDone]) -> None:
+        for entry in done:
+            with self._counts_lock:
+                failed = self._source_counts(entry.source_id).failed
+            if failed:
+                logger.warning(
+                    "Not saving source state, %s items failed to store", failed, extra={"source_id": entry.source_id}
+                )
+                continue
+            try:
+                entry.on_complete()
+            except Exception:
+                logger.exception("Failed to save source state", extra={"source_id": entry.source_id})
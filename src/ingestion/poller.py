@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set
+from urllib.parse import urlparse
+
+from src.ingestion.normalise import ItemData
+
+logger = logging.getLogger(__name__)
+
+GMAIL_HOST = "gmail.googleapis.com"
+
+
+@dataclass
+class PollTask:
+    source_id: str
+    host: str
+    run: Callable[[], Iterable[ItemData]]
+
+
+@dataclass
+class PollResult:
+    source_id: str
+    host: str
+    status: str
+    items: int = 0
+    inserted: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+def source_host(source: dict) -> str:
+    params = source.get("params", {})
+    if source["type"] == "gmail_inbox":
+        return GMAIL_HOST
+    url = params.get("feed_url") or params.get("url") or ""
+    return urlparse(url).netloc.lower() or source["source_id"]
+
+
+def run_polls(
+    tasks: List[PollTask],
+    sink: Callable[[str, Iterable[ItemData]], int],
+    max_workers: int = 8,
+    per_host_limit: int = 2,
+    source_timeout: float = 120.0,
+) -> List[PollResult]:
+    pending: Deque[PollTask] = deque(tasks)
+    in_flight: Dict[Future, PollTask] = {}
+    started: Dict[str, float] = {}
+    host_counts: Dict[str, int] = {}
+    hosts_lock = threading.Lock()
+    timed_out: Set[str] = set()
+    results: List[PollResult] = []
+
+    def release(task: PollTask) -> None:
+        with hosts_lock:
+            host_counts[task.host] -= 1
+
+    def submit_ready() -> None:
+        skipped: Deque[PollTask] = deque()
+        while pending and len(in_flight) < max_workers:
+            task = pending.popleft()
+            with hosts_lock:
+                if host_counts.get(task.host, 0) >= per_host_limit:
+                    skipped.append(task)
+                    continue
+                host_counts[task.host] = host_counts.get(task.host, 0) + 1
+            in_flight[executor.submit(timed, task)] = task
+        pending.extendleft(reversed(skipped))
+
+    def until_timed_out(task: PollTask, items: Iterator[ItemData]) -> Iterator[ItemData]:
+        try:
+            for item in items:
+                if task.source_id in timed_out:
+                    logger.warning("Discarding items from timed out poll", extra={"source_id": task.source_id})
+                    return
+                yield item
+        finally:
+            close = getattr(items, "close", None)
+            if close:
+                close()
+
+    def timed(task: PollTask) -> int:
+        started[task.source_id] = time.monotonic()
+        return sink(task.source_id, until_timed_out(task, iter(task.run())))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="poll")
+    try:
+        submit_ready()
+        while in_flight:
+            done, _ = wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+
+            for future in done:
+                task = in_flight.pop(future)
+                release(task)
+                elapsed = now - started.get(task.source_id, now)
+                result = PollResult(source_id=task.source_id, host=task.host, status="ok", elapsed=elapsed)
+                try:
+                    result.items = future.result()
+                except Exception as exc:
+                    logger.exception("Failed to poll source", extra={"source_id": task.source_id})
+                    result.status = "error"
+                    result.error = str(exc)
+                results.append(result)
+
+            for future, task in list(in_flight.items()):
+                # Time spent queued behind a stuck worker does not count against a source.
+                if task.source_id not in started or now - started[task.source_id] < source_timeout:
+                    continue
+                # The worker thread cannot be interrupted. It keeps its host slot until it
+                # finishes, and stops handing items to the sink.
+                in_flight.pop(future)
+                timed_out.add(task.source_id)
+                future.add_done_callback(lambda _, task=task: release(task))
+                elapsed = now - started[task.source_id]
+                logger.warning("Source poll timed out after %.1fs", elapsed, extra={"source_id": task.source_id})
+                results.append(
+                    PollResult(
+                        source_id=task.source_id,
+                        host=task.host,
+                        status="timeout",
+                        elapsed=elapsed,
+                        error=f"timed out after {source_timeout:.0f}s",
+                    )
+                )
+
+            submit_ready()
+            if not in_flight and pending:
+                # What is left waits on hosts still held by timed out polls.
+                for task in pending:
+                    logger.warning("Host busy with a timed out poll, skipping", extra={"source_id": task.source_id})
+                    results.append(PollResult(task.source_id, task.host, status="skipped", error="host busy"))
+                pending.clear()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
+
+
+def log_poll_summary(results: List[PollResult], wall_time: float) -> None:
+    for result in sorted(results, key=lambda r: r.elapsed, reverse=True):
+        logger.info(
+            "Polled %s (%s): status=%s items=%s inserted=%s wall=%.2fs",
+            result.source_id,
+            result.host,
+            result.status,
+            result.items,
+            result.inserted,
+            result.elapsed,
+        )
+    failed = sum(1 for r in results if r.status != "ok")
+    inserted = sum(r.inserted for r in results)
+    logger.info(
+        "Poll cycle finished: sources=%s failed=%s inserted=%s wall=%.2fs",
+        len(results),
+        failed,
+        inserted,
+        wall_time,
+    )
@@ -1,21 +1,47 @@
 from __future__ import annotations
 
 import logging
-from typing import List
+from typing import Container, Iterator, List, Optional
 
 import feedparser
 
-from src.ingestion.normalise import ItemData, normalise_from_rss
+from src.ingestion.normalise import ItemData, normalise_from_rss, rss_fingerprint
+from src.utils.http import FetchValidators, get_conditional
 
 logger = logging.getLogger(__name__)
 
 
-def poll_rss(source_id: str, feed_url: str, use_entry_published_date: bool) -> List[ItemData]:
-    parsed = feedparser.parse(feed_url)
-    items: List[ItemData] = []
-    for entry in parsed.entries:
+def poll_rss(
+    source_id: str,
+    feed_url: str,
+    use_entry_published_date: bool,
+    validators: Optional[FetchValidators] = None,
+    seen: Optional[Container[str]] = None,
+) -> tuple[Iterator[ItemData], FetchValidators]:
+    response = get_conditional(feed_url, validators)
+    if response.not_modified:
+        logger.debug("Feed not modified", extra={"source_id": source_id})
+        return iter(()), response.validators
+
+    parsed = feedparser.parse(response.content)
+    return iter_rss_items(source_id, parsed.entries, use_entry_published_date, seen), response.validators
+
+
+def iter_rss_items(
+    source_id: str,
+    entries: List[dict],
+    use_entry_published_date: bool,
+    seen: Optional[Container[str]] = None,
+) -> Iterator[ItemData]:
+    skipped = 0
+    for entry in entries:
+        if seen is not None and rss_fingerprint(entry) in seen:
+            skipped += 1
+            continue
         try:
-            items.append(normalise_from_rss(source_id, entry, use_entry_published_date))
+            item = normalise_from_rss(source_id, entry, use_entry_published_date)
         except Exception:
             logger.exception("Failed to normalise RSS entry", extra={"source_id": source_id})
-    return items
+            continue
+        yield item
+    logger.debug("Skipped %s known RSS entries", skipped, extra={"source_id": source_id})
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from sqlalchemy import select
+
+from src.db.models import Item
+from src.db.session import get_session
+
+
+def fingerprint_key(fingerprint: str) -> int:
+    # 64-bit prefix of the sha256 hex digest; far smaller than the string in a set.
+    return int(fingerprint[:16], 16)
+
+
+class SourceFingerprints:
+    def __init__(self, index: "FingerprintIndex", source_id: str) -> None:
+        self.index = index
+        self.source_id = source_id
+
+    def __contains__(self, fingerprint: object) -> bool:
+        return isinstance(fingerprint, str) and self.index.contains(self.source_id, fingerprint)
+
+
+class FingerprintIndex:
+    def __init__(self, session_factory: Callable = get_session) -> None:
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._keys: Dict[str, Set[int]] = {}
+
+    def _load(self, source_id: str) -> Set[int]:
+        keys = self._keys.get(source_id)
+        if keys is None:
+            with self.session_factory() as session:
+                rows = session.execute(select(Item.fingerprint).where(Item.source_id == source_id)).scalars()
+                keys = {fingerprint_key(fp) for fp in rows}
+            self._keys[source_id] = keys
+        return keys
+
+    def view(self, source_id: str) -> SourceFingerprints:
+        with self._lock:
+            self._load(source_id)
+        return SourceFingerprints(self, source_id)
+
+    def contains(self, source_id: str, fingerprint: str) -> bool:
+        with self._lock:
+            return fingerprint_key(fingerprint) in self._load(source_id)
+
+    def add(self, source_id: str, fingerprints: Iterable[str]) -> None:
+        with self._lock:
+            keys = self._keys.get(source_id)
+            if keys is not None:
+                keys.update(fingerprint_key(fp) for fp in fingerprints)
+
+    def invalidate(self, source_id: Optional[str] = None) -> None:
+        with self._lock:
+            if source_id is None:
+                self._keys.clear()
+            else:
+                self._keys.pop(source_id, None)
+
+
+fingerprint_index = FingerprintIndex()
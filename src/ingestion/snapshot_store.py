@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import zlib
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.exc import IntegrityError
+
+from src.db.models import SnapshotContent, SnapshotSighting
+from src.db.models import WebsiteSnapshot as LegacySnapshot
+from src.db.session import get_session
+from src.ingestion.website_change import WebsiteSnapshot
+
+COMPRESSION_LEVEL = 6
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_text(blob: bytes, compression: str) -> str:
+    if compression != "zlib":
+        raise ValueError(f"Unknown snapshot compression: {compression}")
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def load_snapshot_text(content_hash: str) -> Optional[str]:
+    with get_session() as session:
+        row = session.execute(
+            select(SnapshotContent.content_blob, SnapshotContent.compression).where(
+                SnapshotContent.content_hash == content_hash
+            )
+        ).first()
+    if not row:
+        return None
+    return decompress_text(row.content_blob, row.compression)
+
+
+def load_legacy_text(snapshot_id: int) -> Optional[str]:
+    with get_session() as session:
+        return session.execute(
+            select(LegacySnapshot.content_text).where(LegacySnapshot.id == snapshot_id)
+        ).scalar_one_or_none()
+
+
+def latest_snapshot(session, source_id: str) -> Optional[WebsiteSnapshot]:
+    content_hash = session.execute(
+        select(SnapshotSighting.content_hash)
+        .where(SnapshotSighting.source_id == source_id)
+        .order_by(SnapshotSighting.created_at.desc(), SnapshotSighting.id.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if content_hash:
+        return WebsiteSnapshot(content_hash=content_hash, load_text=lambda: load_snapshot_text(content_hash))
+
+    # Sources last polled before the content-addressed store existed.
+    legacy = session.execute(
+        select(LegacySnapshot.id, LegacySnapshot.content_hash)
+        .where(LegacySnapshot.source_id == source_id)
+        .order_by(LegacySnapshot.created_at.desc())
+        .limit(1)
+    ).first()
+    if legacy:
+        return WebsiteSnapshot(content_hash=legacy.content_hash, load_text=lambda: load_legacy_text(legacy.id))
+    return None
+
+
+def record_snapshot(session, source_id: str, url: str, snapshot: WebsiteSnapshot) -> None:
+    stored = session.execute(
+        select(exists().where(SnapshotContent.content_hash == snapshot.content_hash))
+    ).scalar()
+    if not stored:
+        text = snapshot.text()
+        try:
+            with session.begin_nested():
+                session.add(
+                    SnapshotContent(
+                        content_hash=snapshot.content_hash,
+                        compression="zlib",
+                        content_blob=compress_text(text),
+                        size=len(text),
+                    )
+                )
+        except IntegrityError:
+            # Another source stored the same content concurrently.
+            pass
+    session.add(SnapshotSighting(source_id=source_id, url=url, content_hash=snapshot.content_hash))
+    session.commit()
+
+
+def prune_snapshots(session, cutoff: datetime) -> None:
+    session.execute(delete(SnapshotSighting).where(SnapshotSighting.created_at < cutoff))
+    session.execute(
+        delete(SnapshotContent).where(
+            ~exists().where(SnapshotSighting.content_hash == SnapshotContent.content_hash)
+        )
+    )
+    session.execute(delete(LegacySnapshot).where(LegacySnapshot.created_at < cutoff))
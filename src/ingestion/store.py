@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.db.models import UNDATED, Item, ItemCandidate, ItemSignature, SummaryJob
+from src.ingestion.normalise import ItemData
+from src.utils.simhash import signature_hex, simhash
+
+DEFAULT_BATCH_SIZE = 1000
+
+UPSERT_DIALECTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+@dataclass
+class StoreResult:
+    inserted: int = 0
+    skipped: int = 0
+    inserted_ids: List[int] = field(default_factory=list)
+    inserted_by_source: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, item_id: int, source_id: str) -> None:
+        self.inserted += 1
+        self.inserted_ids.append(item_id)
+        self.inserted_by_source[source_id] = self.inserted_by_source.get(source_id, 0) + 1
+
+
+def item_row(item: ItemData) -> dict:
+    return {
+        "source_id": item.source_id,
+        "title": item.title,
+        "content_text": item.content_text,
+        "url": item.url,
+        "published_at": item.published_at,
+        "ingested_at": item.ingested_at,
+        "links": item.links,
+        "fingerprint": item.fingerprint,
+    }
+
+
+def item_simhash(title: Optional[str], content_text: str) -> Optional[int]:
+    return simhash(f"{title or ''}\n{content_text}")
+
+
+def insert_signatures(session, items: Iterable[Tuple[int, ItemData]]) -> None:
+    rows = []
+    for item_id, item in items:
+        signature = item_simhash(item.title, item.content_text)
+        if signature is not None:
+            rows.append({"item_id": item_id, "simhash": signature_hex(signature)})
+    if rows:
+        session.execute(insert(ItemSignature), rows)
+
+
+def insert_candidates(session, items: Iterable[Tuple[int, ItemData]]) -> None:
+    rows = [
+        {
+            "item_id": item_id,
+            "source_id": item.source_id,
+            "published_at": item.published_at,
+            "ingested_at": item.ingested_at,
+            "published_key": item.published_at or UNDATED,
+            "rank_time": item.published_at or item.ingested_at,
+            "fingerprint": item.fingerprint,
+        }
+        for item_id, item in items
+    ]
+    if rows:
+        session.execute(insert(ItemCandidate), rows)
+
+
+def insert_summary_jobs(session, item_ids: Iterable[int]) -> None:
+    rows = [{"item_id": item_id} for item_id in item_ids]
+    if rows:
+        session.execute(insert(SummaryJob), rows)
+
+
+def index_items(session, items: Iterable[Tuple[int, ItemData]], enqueue_summaries: bool = True) -> None:
+    # Selection reads these side tables instead of scanning items.
+    items = list(items)
+    insert_signatures(session, items)
+    insert_candidates(session, items)
+    if enqueue_summaries:
+        insert_summary_jobs(session, [item_id for item_id, _ in items])
+
+
+def insert_items(
+    session,
+    items: Iterable[ItemData],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    enqueue_summaries: bool = True,
+) -> StoreResult:
+    insert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    if insert is None:
+        return insert_items_one_by_one(session, items, enqueue_summaries)
+
+    result = StoreResult()
+    statement = (
+        insert(Item)
+        .on_conflict_do_nothing(index_elements=["source_id", "fingerprint"])
+        .returning(Item.id, Item.source_id, Item.fingerprint)
+    )
+    batch: List[dict] = []
+    pending: Dict[Tuple[str, str], ItemData] = {}
+
+    def flush() -> None:
+        rows = session.execute(statement, batch).all()
+        for row in rows:
+            result.record(row.id, row.source_id)
+        index_items(session, ((row.id, pending[(row.source_id, row.fingerprint)]) for row in rows), enqueue_summaries)
+        result.skipped += len(batch) - len(rows)
+        batch.clear()
+        pending.clear()
+
+    for item in items:
+        batch.append(item_row(item))
+        pending[(item.source_id, item.fingerprint)] = item
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return result
+
+
+def insert_items_one_by_one(session, items: Iterable[ItemData], enqueue_summaries: bool = True) -> StoreResult:
+    result = StoreResult()
+    for item in items:
+        exists = (
+            session.query(Item.id)
+            .filter(Item.source_id == item.source_id, Item.fingerprint == item.fingerprint)
+            .first()
+        )
+        if exists:
+            result.skipped += 1
+            continue
+        row = Item(**item_row(item))
+        session.add(row)
+        session.flush()
+        result.record(row.id, row.source_id)
+        index_items(session, [(row.id, item)], enqueue_summaries)
+    return result
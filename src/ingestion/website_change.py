@@ -1,41 +1,40 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from difflib import SequenceMatcher
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Set
 
 from bs4 import BeautifulSoup
 
-from src.ingestion.normalise import clean_text, extract_links_from_html, normalise_from_website
+from src.ingestion.browser_pool import get_browser_pool
+from src.ingestion.html_extract import PARSER, element_text_and_links
+from src.ingestion.normalise import clean_text, normalise_from_website
 from src.utils.hashing import sha256_text
-from src.utils.http import get_text
+from src.utils.http import FetchValidators, get_conditional, get_text
 
 logger = logging.getLogger(__name__)
 
+SHINGLE_SIZE = 4
+
 
 @dataclass
 class WebsiteSnapshot:
-    content_text: str
     content_hash: str
+    content_text: Optional[str] = None
+    load_text: Optional[Callable[[], str]] = field(default=None, repr=False, compare=False)
+
+    def text(self) -> str:
+        if self.content_text is None and self.load_text is not None:
+            self.content_text = self.load_text()
+        return self.content_text or ""
 
 
 def fetch_page(url: str, fetch_method: str) -> str:
     if fetch_method == "requests":
         return get_text(url)
     if fetch_method == "playwright":
-        try:
-            from playwright.sync_api import sync_playwright
-        except ImportError as exc:
-            raise RuntimeError("Playwright not installed") from exc
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            page.goto(url, wait_until="networkidle")
-            html = page.content()
-            browser.close()
-            return html
+        return get_browser_pool().fetch(url)
     raise ValueError(f"Unknown fetch_method: {fetch_method}")
 
 
@@ -46,7 +45,7 @@ def extract_content(
     remove_css: Optional[List[str]],
     strip_whitespace: bool,
 ) -> tuple[str, str, List[str]]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, PARSER)
 
     if remove_css:
         for selector in remove_css:
@@ -65,17 +64,44 @@ def extract_content(
     if not content_el:
         content_el = soup.body or soup
 
-    content_text = clean_text(content_el.get_text(" "), strip_whitespace)
-    links = extract_links_from_html(str(content_el))
+    content_text, links = element_text_and_links(content_el, strip_whitespace)
 
     return title, content_text, links
 
 
-def diff_ratio(old_text: str, new_text: str) -> float:
+def text_diff_ratio(old_text: str, new_text: str) -> float:
     matcher = SequenceMatcher(None, old_text, new_text)
     return 1.0 - matcher.ratio()
 
 
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    words = text.split()
+    if len(words) <= size:
+        return {hash(" ".join(words))} if words else set()
+    return {hash(" ".join(words[i : i + size])) for i in range(len(words) - size + 1)}
+
+
+def shingle_diff_ratio(old_text: str, new_text: str) -> float:
+    old_shingles = shingle_hashes(old_text)
+    new_shingles = shingle_hashes(new_text)
+    union = len(old_shingles | new_shingles)
+    if not union:
+        return 0.0
+    return 1.0 - len(old_shingles & new_shingles) / union
+
+
+DIFF_METHODS: Dict[str, Callable[[str, str], float]] = {
+    "text": text_diff_ratio,
+    "shingle": shingle_diff_ratio,
+}
+
+
+def diff_ratio(old_text: str, new_text: str, method: str = "text") -> float:
+    if method not in DIFF_METHODS:
+        raise ValueError(f"Unknown diff method: {method}")
+    return DIFF_METHODS[method](old_text, new_text)
+
+
 def detect_change(
     source_id: str,
     url: str,
@@ -86,8 +112,17 @@ def detect_change(
     strip_whitespace: bool,
     change_threshold_ratio: float,
     previous_snapshot: Optional[WebsiteSnapshot],
-) -> tuple[Optional[WebsiteSnapshot], Optional[dict]]:
-    html = fetch_page(url, fetch_method)
+    validators: Optional[FetchValidators] = None,
+    diff_method: str = "text",
+) -> tuple[Optional[WebsiteSnapshot], Optional[dict], Optional[FetchValidators]]:
+    if fetch_method == "requests":
+        response = get_conditional(url, validators)
+        if response.not_modified:
+            return None, None, response.validators
+        html = response.text
+        validators = response.validators
+    else:
+        html = fetch_page(url, fetch_method)
     title, content_text, links = extract_content(
         html,
         content_css=content_css,
@@ -100,10 +135,10 @@ def detect_change(
 
     if previous_snapshot:
         if previous_snapshot.content_hash == current_hash:
-            return snapshot, None
-        ratio = diff_ratio(previous_snapshot.content_text, content_text)
+            return snapshot, None, validators
+        ratio = diff_ratio(previous_snapshot.text(), content_text, diff_method)
         if ratio < change_threshold_ratio:
-            return snapshot, None
+            return snapshot, None, validators
 
     item = normalise_from_website(
         source_id=source_id,
@@ -112,4 +147,4 @@ def detect_change(
         content_text=content_text,
         links=links,
     )
-    return snapshot, item
+    return snapshot, item, validators
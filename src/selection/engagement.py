@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from src.db.models import EngagementDaily
+from src.tracking.rollup import SOURCE
+
+# Sends worth of the overall click-through rate mixed into every source, so a
+# source with a handful of sends does not swing to an extreme boost.
+PRIOR_SENDS = 20
+
+
+def engagement_boosts(
+    session,
+    source_ids: List[str],
+    days: int,
+    weight: float,
+    today: Optional[date] = None,
+) -> Dict[str, float]:
+    since = (today or date.today()) - timedelta(days=days)
+    rows = session.execute(
+        select(EngagementDaily.key, func.sum(EngagementDaily.sends), func.sum(EngagementDaily.clicks))
+        .where(EngagementDaily.dimension == SOURCE)
+        .where(EngagementDaily.key.in_(source_ids))
+        .where(EngagementDaily.day >= since)
+        .group_by(EngagementDaily.key)
+    ).all()
+    total_sends = sum(sends for _, sends, _ in rows)
+    total_clicks = sum(clicks for _, _, clicks in rows)
+    if not total_sends or not total_clicks:
+        return {}
+
+    # Boost is the source's relative click-through lift over the newsletter's sources.
+    overall = total_clicks / total_sends
+    boosts = {}
+    for source_id, sends, clicks in rows:
+        smoothed = (clicks + PRIOR_SENDS * overall) / (sends + PRIOR_SENDS)
+        boosts[source_id] = weight * (smoothed / overall - 1.0)
+    return boosts
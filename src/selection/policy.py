@@ -1,12 +1,82 @@
 from __future__ import annotations
 
+import dataclasses
+import logging
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional, Set
 
-from sqlalchemy import select
+from sqlalchemy import select, union_all
 
-from src.db.models import Item
-from src.selection.ranker import score_item
+from src.db.models import Item, ItemCandidate, ItemSignature
+from src.ingestion.store import item_simhash
+from src.selection.engagement import engagement_boosts
+from src.selection.ranker import CandidateBatch, Ranker
+from src.utils.simhash import SimHashIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NEAR_DUPLICATE_DISTANCE = 8
+# Skipped duplicates do not use up a source's slots, so deduping needs
+# more than per_source_limit candidates per source.
+DEDUPE_OVERFETCH = 2
+DEFAULT_ENGAGEMENT_DAYS = 30
+# SQLite allows at most 500 terms in a compound SELECT (SQLITE_MAX_COMPOUND_SELECT).
+UNION_SOURCES = 400
+
+
+def candidate_query(
+    source_ids: List[str],
+    start: datetime,
+    per_source_cap: Optional[int],
+    source_order: Optional[tuple] = None,
+):
+    query = (
+        select(
+            ItemCandidate.item_id.label("id"),
+            ItemCandidate.source_id,
+            ItemCandidate.published_at,
+            ItemCandidate.ingested_at,
+            ItemCandidate.fingerprint,
+            ItemSignature.simhash,
+        )
+        .outerjoin(ItemSignature, ItemSignature.item_id == ItemCandidate.item_id)
+        .where(ItemCandidate.ingested_at >= start)
+    )
+    if per_source_cap is None or source_order is None:
+        return query.where(ItemCandidate.source_id.in_(source_ids))
+
+    # Within one source every item has the same weight, so the ranker's score
+    # order is an indexed column order and each source contributes only its
+    # top per_source_cap rows.
+    parts = [
+        query.where(ItemCandidate.source_id == source_id).order_by(*source_order).limit(per_source_cap).subquery()
+        for source_id in source_ids
+    ]
+    return union_all(*(select(part) for part in parts))
+
+
+def candidate_rows(
+    session,
+    source_ids: List[str],
+    start: datetime,
+    per_source_cap: Optional[int],
+    source_order: Optional[tuple],
+) -> list:
+    if per_source_cap is None or source_order is None:
+        return session.execute(candidate_query(source_ids, start, per_source_cap, source_order)).all()
+    rows: list = []
+    for offset in range(0, len(source_ids), UNION_SOURCES):
+        group = source_ids[offset : offset + UNION_SOURCES]
+        rows.extend(session.execute(candidate_query(group, start, per_source_cap, source_order)).all())
+    return rows
+
+
+def missing_signatures(session, item_ids: List[int]) -> Dict[int, Optional[int]]:
+    # Items stored before signatures existed.
+    if not item_ids:
+        return {}
+    rows = session.execute(select(Item.id, Item.title, Item.content_text).where(Item.id.in_(item_ids)))
+    return {row.id: item_simhash(row.title, row.content_text) for row in rows}
 
 
 def select_items(
@@ -15,32 +85,120 @@ def select_items(
     window_days: int,
     max_items_total: int,
     per_source_limit: int | None,
-    source_type_map: Dict[str, str],
-    weights: Dict[str, float],
+    ranker: Ranker,
+    dedupe_across_sources: bool = False,
+    near_duplicate_distance: int = DEFAULT_NEAR_DUPLICATE_DISTANCE,
+    engagement_weight: float = 0.0,
+    engagement_days: int = DEFAULT_ENGAGEMENT_DAYS,
 ) -> List[Item]:
+    if not source_ids:
+        return []
     end = datetime.now(timezone.utc)
     start = end - timedelta(days=window_days)
 
-    query = select(Item).where(Item.source_id.in_(source_ids)).where(Item.ingested_at >= start)
-    items = session.execute(query).scalars().all()
+    if engagement_weight:
+        boosts = dict(ranker.boosts)
+        for source_id, boost in engagement_boosts(session, source_ids, engagement_days, engagement_weight).items():
+            boosts[source_id] = boosts.get(source_id, 0.0) + boost
+        ranker = dataclasses.replace(ranker, boosts=boosts)
+
+    # No source can contribute more than max_items_total, so every newsletter
+    # reads at most a short top list per source.
+    source_limit = min(per_source_limit or max_items_total, max_items_total)
+    source_order = ranker.source_order(source_ids)
+    cap = source_limit if source_order is not None else None
+    if cap is not None and dedupe_across_sources:
+        cap *= DEDUPE_OVERFETCH
+    while True:
+        rows = candidate_rows(session, source_ids, start, cap, source_order)
+        selected_ids, short_sources = rank_candidates(
+            session,
+            rows,
+            max_items_total,
+            per_source_limit,
+            source_limit,
+            cap,
+            ranker,
+            dedupe_across_sources,
+            near_duplicate_distance,
+        )
+        if not short_sources:
+            break
+        # Those sources ran out of candidates to duplicates; their next item may outrank the selection.
+        logger.debug("Refetching selection candidates for %s", sorted(short_sources))
+        cap *= 2
+
+    if not selected_ids:
+        return []
+    items = session.execute(select(Item).where(Item.id.in_(selected_ids))).scalars().all()
+    by_id = {item.id: item for item in items}
+    return [by_id[item_id] for item_id in selected_ids]
 
-    scored = []
-    for item in items:
-        source_type = source_type_map.get(item.source_id, "rss")
-        scored.append((score_item(item.published_at, source_type, weights), item))
 
-    scored.sort(key=lambda tup: tup[0], reverse=True)
+def rank_candidates(
+    session,
+    rows: list,
+    max_items_total: int,
+    per_source_limit: Optional[int],
+    source_limit: int,
+    cap: Optional[int],
+    ranker: Ranker,
+    dedupe_across_sources: bool,
+    near_duplicate_distance: int,
+) -> tuple[List[int], Set[str]]:
+    fetched_counts: Dict[str, int] = {}
+    for row in rows:
+        fetched_counts[row.source_id] = fetched_counts.get(row.source_id, 0) + 1
 
+    # Ties fall back to id, matching the per-source order used in SQL.
+    batch = CandidateBatch.from_rows(rows)
+    scored = [rows[i] for i in batch.order(ranker.score(batch))]
+
+    signatures: Dict[int, Optional[int]] = {}
+    if dedupe_across_sources:
+        signatures = {row.id: int(row.simhash, 16) for row in rows if row.simhash}
+        signatures.update(missing_signatures(session, [row.id for row in rows if not row.simhash]))
+
+    # Items are visited in rank order and only compared with items already
+    # selected, so each near-duplicate cluster is represented by its highest
+    # ranked member that fits the per-source limit.
+    fingerprints: Set[str] = set()
+    index = SimHashIndex(near_duplicate_distance)
+    duplicates = 0
+
+    visited_counts: Dict[str, int] = {}
     per_source_counts: Dict[str, int] = {}
-    selected = []
-    for _, item in scored:
+    selected: List[int] = []
+    for row in scored:
+        visited_counts[row.source_id] = visited_counts.get(row.source_id, 0) + 1
+        simhash = signatures.get(row.id)
+        if dedupe_across_sources:
+            if row.fingerprint in fingerprints or (simhash is not None and index.near(simhash)):
+                duplicates += 1
+                continue
         if per_source_limit is not None:
-            count = per_source_counts.get(item.source_id, 0)
+            count = per_source_counts.get(row.source_id, 0)
             if count >= per_source_limit:
                 continue
-        selected.append(item)
-        per_source_counts[item.source_id] = per_source_counts.get(item.source_id, 0) + 1
+        selected.append(row.id)
+        per_source_counts[row.source_id] = per_source_counts.get(row.source_id, 0) + 1
+        if dedupe_across_sources:
+            fingerprints.add(row.fingerprint)
+            if simhash is not None:
+                index.add(row.id, simhash)
         if len(selected) >= max_items_total:
             break
 
-    return selected
+    short_sources: Set[str] = set()
+    if cap is not None:
+        short_sources = {
+            source_id
+            for source_id, fetched in fetched_counts.items()
+            if fetched == cap
+            and visited_counts.get(source_id) == fetched
+            and per_source_counts.get(source_id, 0) < source_limit
+        }
+
+    if duplicates:
+        logger.info("Dropped %s near-duplicate items", duplicates)
+    return selected, short_sources
@@ -23,10 +23,38 @@ class Settings:
     ollama_model: str
     openai_api_key: str
     openai_model: str
+    openai_concurrency: int
+    openai_requests_per_minute: int
+    openai_tokens_per_minute: int
+    ollama_concurrency: int
+    ollama_requests_per_minute: int
+    ollama_tokens_per_minute: int
     tracking_token_secret: str
     tracking_host: str
     tracking_port: int
     config_dir: Path
+    poll_max_workers: int
+    poll_per_host_limit: int
+    poll_source_timeout_seconds: float
+    poll_jitter_seconds: int
+    playwright_max_pages: int
+    playwright_block_resources: bool
+    playwright_recycle_after: int
+    ingest_batch_size: int
+    ingest_flush_seconds: float
+    ingest_queue_size: int
+    engagement_rollup_minutes: int
+    summary_batch_size: int
+    summary_batch_tokens: int
+    summary_max_input_tokens: int
+    summary_map_reduce_tokens: int
+    summary_max_chunks: int
+    summary_queue_minutes: int
+    summary_queue_batch: int
+    summary_queue_concurrency: int
+    template_cache_dir: str
+    summary_cache_days: int
+    summary_cache_max_entries: int
 
 
 def load_settings() -> Settings:
@@ -46,6 +74,12 @@ def load_settings() -> Settings:
     ollama_model = os.getenv("OLLAMA_MODEL", "llama3.1")
     openai_api_key = os.getenv("OPENAI_API_KEY", "")
     openai_model = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+    openai_concurrency = int(os.getenv("OPENAI_CONCURRENCY", "4"))
+    openai_requests_per_minute = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "300"))
+    openai_tokens_per_minute = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "150000"))
+    ollama_concurrency = int(os.getenv("OLLAMA_CONCURRENCY", "2"))
+    ollama_requests_per_minute = int(os.getenv("OLLAMA_REQUESTS_PER_MINUTE", "0"))
+    ollama_tokens_per_minute = int(os.getenv("OLLAMA_TOKENS_PER_MINUTE", "0"))
 
     tracking_token_secret = os.getenv("TRACKING_TOKEN_SECRET", "")
     tracking_host = os.getenv("TRACKING_HOST", "127.0.0.1")
@@ -53,6 +87,30 @@ def load_settings() -> Settings:
 
     config_dir = Path(os.getenv("CONFIG_DIR", "config")).resolve()
 
+    poll_max_workers = int(os.getenv("POLL_MAX_WORKERS", "8"))
+    poll_per_host_limit = int(os.getenv("POLL_PER_HOST_LIMIT", "2"))
+    poll_source_timeout_seconds = float(os.getenv("POLL_SOURCE_TIMEOUT_SECONDS", "120"))
+    poll_jitter_seconds = int(os.getenv("POLL_JITTER_SECONDS", "300"))
+
+    playwright_max_pages = int(os.getenv("PLAYWRIGHT_MAX_PAGES", "2"))
+    playwright_block_resources = os.getenv("PLAYWRIGHT_BLOCK_RESOURCES", "true").lower() in ("1", "true", "yes")
+    playwright_recycle_after = int(os.getenv("PLAYWRIGHT_RECYCLE_AFTER", "100"))
+    ingest_batch_size = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+    ingest_flush_seconds = float(os.getenv("INGEST_FLUSH_SECONDS", "5"))
+    ingest_queue_size = int(os.getenv("INGEST_QUEUE_SIZE", "1000"))
+    engagement_rollup_minutes = int(os.getenv("ENGAGEMENT_ROLLUP_MINUTES", "15"))
+    summary_batch_size = int(os.getenv("SUMMARY_BATCH_SIZE", "8"))
+    summary_batch_tokens = int(os.getenv("SUMMARY_BATCH_TOKENS", "6000"))
+    summary_max_input_tokens = int(os.getenv("SUMMARY_MAX_INPUT_TOKENS", "3000"))
+    summary_map_reduce_tokens = int(os.getenv("SUMMARY_MAP_REDUCE_TOKENS", "12000"))
+    summary_max_chunks = int(os.getenv("SUMMARY_MAX_CHUNKS", "8"))
+    summary_queue_minutes = int(os.getenv("SUMMARY_QUEUE_MINUTES", "2"))
+    summary_queue_batch = int(os.getenv("SUMMARY_QUEUE_BATCH", "50"))
+    summary_queue_concurrency = int(os.getenv("SUMMARY_QUEUE_CONCURRENCY", "1"))
+    template_cache_dir = os.getenv("TEMPLATE_CACHE_DIR", "")
+    summary_cache_days = int(os.getenv("SUMMARY_CACHE_DAYS", "30"))
+    summary_cache_max_entries = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "20000"))
+
     return Settings(
         app_base_url=app_base_url,
         timezone=timezone,
@@ -66,10 +124,38 @@ def load_settings() -> Settings:
         ollama_model=ollama_model,
         openai_api_key=openai_api_key,
         openai_model=openai_model,
+        openai_concurrency=openai_concurrency,
+        openai_requests_per_minute=openai_requests_per_minute,
+        openai_tokens_per_minute=openai_tokens_per_minute,
+        ollama_concurrency=ollama_concurrency,
+        ollama_requests_per_minute=ollama_requests_per_minute,
+        ollama_tokens_per_minute=ollama_tokens_per_minute,
         tracking_token_secret=tracking_token_secret,
         tracking_host=tracking_host,
         tracking_port=tracking_port,
         config_dir=config_dir,
+        poll_max_workers=poll_max_workers,
+        poll_per_host_limit=poll_per_host_limit,
+        poll_source_timeout_seconds=poll_source_timeout_seconds,
+        poll_jitter_seconds=poll_jitter_seconds,
+        playwright_max_pages=playwright_max_pages,
+        playwright_block_resources=playwright_block_resources,
+        playwright_recycle_after=playwright_recycle_after,
+        ingest_batch_size=ingest_batch_size,
+        ingest_flush_seconds=ingest_flush_seconds,
+        ingest_queue_size=ingest_queue_size,
+        engagement_rollup_minutes=engagement_rollup_minutes,
+        summary_batch_size=summary_batch_size,
+        summary_batch_tokens=summary_batch_tokens,
+        summary_max_input_tokens=summary_max_input_tokens,
+        summary_map_reduce_tokens=summary_map_reduce_tokens,
+        summary_max_chunks=summary_max_chunks,
+        summary_queue_minutes=summary_queue_minutes,
+        summary_queue_batch=summary_queue_batch,
+        summary_queue_concurrency=summary_queue_concurrency,
+        template_cache_dir=template_cache_dir,
+        summary_cache_days=summary_cache_days,
+        summary_cache_max_entries=summary_cache_max_entries,
     )
 
 
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.summarisation.budget import estimate_tokens
+from src.summarisation.prompts import BATCH_SUMMARY_TEMPLATE, SUMMARY_SYSTEM
+from src.summarisation.provider import SummaryProvider, SummaryRequest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_TOKENS = 6000
+# Per-item allowance for the JSON wrapping and the item's share of the reply.
+ITEM_OVERHEAD_TOKENS = 150
+
+
+def rules_of(request: SummaryRequest) -> Tuple[str, str, str, str]:
+    return request.style, request.length, request.tone, request.language
+
+
+def pack_batches(
+    entries: Sequence[Tuple[str, SummaryRequest]], max_items: int, max_tokens: int = DEFAULT_BATCH_TOKENS
+) -> List[List[Tuple[str, SummaryRequest]]]:
+    # Items sharing summary rules are packed greedily in order; an item over
+    # the budget on its own ends up alone and is summarised per item.
+    batches: List[List[Tuple[str, SummaryRequest]]] = []
+    open_batches: Dict[Tuple[str, str, str, str], Tuple[List[Tuple[str, SummaryRequest]], int]] = {}
+    for key, request in entries:
+        rules = rules_of(request)
+        tokens = estimate_tokens(request.content) + ITEM_OVERHEAD_TOKENS
+        batch, used = open_batches.get(rules, (None, 0))
+        if batch is None or len(batch) >= max_items or used + tokens > max_tokens:
+            batch, used = [], 0
+            batches.append(batch)
+        batch.append((key, request))
+        open_batches[rules] = (batch, used + tokens)
+    return batches
+
+
+def batch_prompt(requests: Sequence[SummaryRequest]) -> str:
+    first = requests[0]
+    items = [{"id": str(index), "content": request.content} for index, request in enumerate(requests, start=1)]
+    return BATCH_SUMMARY_TEMPLATE.format(
+        style=first.style,
+        length=first.length,
+        tone=first.tone,
+        language=first.language,
+        items=json.dumps(items, ensure_ascii=False, indent=1),
+    )
+
+
+def parse_batch_response(text: str, count: int) -> List[Optional[str]]:
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        data = json.loads(text[start : end + 1]) if start != -1 and end > start else {}
+    except json.JSONDecodeError:
+        data = {}
+    results: List[Optional[str]] = []
+    for index in range(1, count + 1):
+        value = data.get(str(index)) if isinstance(data, dict) else None
+        results.append(value.strip() if isinstance(value, str) and value.strip() else None)
+    return results
+
+
+def summarize_batch(provider: SummaryProvider, requests: Sequence[SummaryRequest]) -> List[Optional[str]]:
+    # One retry with only the items that did not come back; anything still
+    # missing is left as None for the per-item path.
+    results: List[Optional[str]] = [None] * len(requests)
+    pending = list(range(len(requests)))
+    for attempt in range(2):
+        started = time.monotonic()
+        try:
+            text = provider.complete(SUMMARY_SYSTEM, batch_prompt([requests[i] for i in pending]), json_output=True)
+        except Exception as exc:
+            logger.warning("Batch summary of %s items failed: %s", len(pending), exc)
+            break
+        parsed = parse_batch_response(text, len(pending))
+        for index, summary in zip(pending, parsed):
+            results[index] = summary
+        missing = [index for index in pending if results[index] is None]
+        logger.info(
+            "Summarised batch of %s items in %.2fs, %s unparsed",
+            len(pending),
+            time.monotonic() - started,
+            len(missing),
+        )
+        if len(missing) <= 1:
+            break
+        pending = missing
+    return results
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterator, List
+
+from src.summarisation.extractive import split_sentences
+
+CHARS_PER_TOKEN = 4
+BOILERPLATE = re.compile(
+    r"unsubscribe|view (?:this email |it )?in (?:your |a )?browser|all rights reserved|©|copyright \d{4}|"
+    r"privacy policy|manage (?:your )?(?:email )?preferences|you(?:'re| are) receiving this|forward(?:ed)? to a friend|"
+    r"follow us on|we use cookies|accept (?:all )?cookies",
+    re.IGNORECASE,
+)
+# Sentences this long are mostly real content even if they mention a marker.
+BOILERPLATE_MAX_CHARS = 300
+
+
+def estimate_tokens(text: str) -> int:
+    # About four characters per token for English prose.
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def strip_boilerplate(text: str) -> str:
+    seen = set()
+    lines = []
+    for line in text.splitlines():
+        kept = []
+        for sentence in split_sentences(line):
+            if len(sentence) <= BOILERPLATE_MAX_CHARS and BOILERPLATE.search(sentence):
+                continue
+            # Menus and footers repeated through a page are only worth sending once.
+            if len(sentence) < BOILERPLATE_MAX_CHARS and sentence in seen:
+                continue
+            seen.add(sentence)
+            kept.append(sentence)
+        if kept:
+            lines.append(" ".join(kept))
+    return "\n".join(lines)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    # Prefer ending on a sentence, then a word, within the last fifth of the budget.
+    floor = int(limit * 0.8)
+    for boundary in (max(cut.rfind(". "), cut.rfind(".\n"), cut.rfind("\n")), cut.rfind(" ")):
+        if boundary >= floor:
+            return cut[: boundary + 1].rstrip()
+    return cut
+
+
+def pieces(text: str, max_chars: int) -> Iterator[str]:
+    for sentence in split_sentences(text):
+        for start in range(0, len(sentence), max_chars):
+            yield sentence[start : start + max_chars]
+
+
+def split_chunks(text: str, chunk_tokens: int) -> List[str]:
+    max_chars = chunk_tokens * CHARS_PER_TOKEN
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in pieces(text, max_chars):
+        if current and size + len(piece) + 1 > max_chars:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+@dataclass(frozen=True)
+class TokenBudget:
+    max_input_tokens: int = 3000
+    map_reduce_tokens: int = 12000
+    max_chunks: int = 8
+
+    def plan(self, content: str) -> List[str]:
+        # One part to summarise directly, or several chunks to summarise and merge.
+        content = strip_boilerplate(content)
+        tokens = estimate_tokens(content)
+        if tokens <= self.max_input_tokens:
+            return [content]
+        if tokens <= self.map_reduce_tokens:
+            return [truncate_to_tokens(content, self.max_input_tokens)]
+        content = truncate_to_tokens(content, self.max_input_tokens * self.max_chunks)
+        return split_chunks(content, self.max_input_tokens)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+
+from src.db.models import SummaryCacheEntry
+from src.ingestion.store import UPSERT_DIALECTS
+from src.summarisation.prompts import PROMPT_VERSION
+from src.summarisation.provider import SummaryRequest
+from src.utils.hashing import sha256_text
+
+logger = logging.getLogger(__name__)
+
+
+def summary_key(provider_name: str, request: SummaryRequest) -> str:
+    # Provider names carry the model, e.g. "openai:gpt-4.1-mini".
+    parts = [
+        PROMPT_VERSION,
+        provider_name,
+        request.style,
+        request.length,
+        request.tone,
+        request.language,
+        sha256_text(request.content),
+    ]
+    return sha256_text(json.dumps(parts))
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SummaryCache:
+    def __init__(self, session) -> None:
+        self.session = session
+        self.stats = CacheStats()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found = dict(
+            self.session.execute(
+                select(SummaryCacheEntry.key, SummaryCacheEntry.summary).where(SummaryCacheEntry.key.in_(keys))
+            ).all()
+        )
+        if found:
+            self.session.execute(
+                update(SummaryCacheEntry)
+                .where(SummaryCacheEntry.key.in_(list(found)))
+                .values(hits=SummaryCacheEntry.hits + 1, last_used_at=datetime.utcnow())
+            )
+        self.stats.hits += len(found)
+        self.stats.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: str, provider_name: str, summary: str) -> None:
+        now = datetime.utcnow()
+        values = {"key": key, "provider": provider_name, "summary": summary, "created_at": now, "last_used_at": now}
+        upsert = UPSERT_DIALECTS.get(self.session.get_bind().dialect.name)
+        if upsert is None:
+            self.session.execute(insert(SummaryCacheEntry).values(**values))
+            return
+        # Another build may have summarised the same content concurrently.
+        self.session.execute(upsert(SummaryCacheEntry).values(**values).on_conflict_do_nothing(index_elements=["key"]))
+
+
+def evict_summaries(session, max_age_days: int, max_entries: int, now: Optional[datetime] = None) -> int:
+    cutoff = (now or datetime.utcnow()) - timedelta(days=max_age_days)
+    removed = session.execute(delete(SummaryCacheEntry).where(SummaryCacheEntry.last_used_at < cutoff)).rowcount
+    total = session.execute(select(func.count()).select_from(SummaryCacheEntry)).scalar_one()
+    if total > max_entries:
+        oldest = (
+            select(SummaryCacheEntry.id)
+            .order_by(SummaryCacheEntry.last_used_at.asc(), SummaryCacheEntry.id.asc())
+            .limit(total - max_entries)
+        )
+        removed += session.execute(
+            delete(SummaryCacheEntry).where(SummaryCacheEntry.id.in_(oldest.scalar_subquery()))
+        ).rowcount
+    if removed:
+        logger.info("Evicted %s cached summaries", removed)
+    return removed
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import re
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+ABBREVIATIONS = set(
+    "mr mrs ms dr prof sr jr st vs etc inc ltd co corp no fig e.g i.e approx dept est jan feb mar apr jun jul aug "
+    "sep sept oct nov dec u.s u.k e.u".split()
+)
+STOPWORDS = set(
+    "a about after all also an and any are as at be been but by can could did do does for from had has have he her "
+    "his how i if in into is it its just more most new not of on one or our out over said she so some than that the "
+    "their them then there these they this to up was we were what when which who will with would you your".split()
+)
+# A run of terminal punctuation, optional closing quotes/brackets, then whitespace.
+BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s+")
+WORD = re.compile(r"[a-z0-9][a-z0-9'-]*[a-z0-9]|[a-z0-9]")
+MAX_SENTENCES = 200
+MIN_SENTENCE_CHARS = 20
+DAMPING = 0.85
+ITERATIONS = 30
+# Weight of relevance against redundancy when picking sentences (MMR).
+MMR_LAMBDA = 0.7
+DUPLICATE_SIMILARITY = 0.8
+
+
+def is_initial(word: str, following: str) -> bool:
+    # "J. R. Hartley" but not "plan B. Then we left."
+    if not re.fullmatch(r"[A-Z]", word):
+        return False
+    if re.fullmatch(r"[A-Z]\.", following):
+        return True
+    return following[:1].isupper() and following.strip(".,;:!?\"')").lower() not in STOPWORDS
+
+
+def split_sentences(text: str) -> List[str]:
+    result: List[str] = []
+    for line in text.splitlines():
+        start = 0
+        for match in BOUNDARY.finditer(line):
+            before = line[start : match.start()].rsplit(None, 1)
+            last = before[-1] if before else ""
+            following = line[match.end() :].split(None, 1)
+            # "Dr. Smith", "e.g. this", "J. Smith": the period is not a sentence end.
+            if match.group().startswith(".") and (
+                last.lower().rstrip(".") in ABBREVIATIONS or is_initial(last, following[0] if following else "")
+            ):
+                continue
+            nxt = line[match.end() : match.end() + 1]
+            if nxt and nxt.islower():
+                continue
+            result.append(line[start : match.end()].strip())
+            start = match.end()
+        result.append(line[start:].strip())
+    return [sentence for sentence in result if sentence]
+
+
+def terms(sentence: str) -> List[str]:
+    return [word for word in WORD.findall(sentence.lower()) if word not in STOPWORDS and len(word) > 2]
+
+
+def textrank(similarity: np.ndarray) -> np.ndarray:
+    count = similarity.shape[0]
+    weights = similarity.copy()
+    np.fill_diagonal(weights, 0.0)
+    totals = weights.sum(axis=1, keepdims=True)
+    transition = np.divide(weights, totals, out=np.full_like(weights, 1.0 / count), where=totals > 0)
+    scores = np.full(count, 1.0 / count)
+    for _ in range(ITERATIONS):
+        scores = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+    return scores
+
+
+def select_sentences(similarity: np.ndarray, relevance: np.ndarray, count: int) -> List[int]:
+    chosen: List[int] = []
+    candidates = np.ones(len(relevance), dtype=bool)
+    while len(chosen) < count and candidates.any():
+        redundancy = similarity[:, chosen].max(axis=1) if chosen else np.zeros(len(relevance))
+        mmr = MMR_LAMBDA * relevance - (1 - MMR_LAMBDA) * redundancy
+        mmr[~candidates] = -np.inf
+        best = int(np.argmax(mmr))
+        candidates[best] = False
+        if redundancy[best] < DUPLICATE_SIMILARITY:
+            chosen.append(best)
+    return sorted(chosen)
+
+
+def term_positions(doc: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    rows = np.repeat(np.arange(len(doc)), [len(sentence) for sentence in doc])
+    columns = np.fromiter(chain.from_iterable(doc), dtype=np.int64, count=len(rows))
+    return rows, columns
+
+
+def summarize_texts(texts: Sequence[str], counts: Sequence[int]) -> List[str]:
+    # Scores every item of an issue together so IDF reflects the whole batch.
+    documents = [split_sentences(text)[:MAX_SENTENCES] for text in texts]
+    vocabulary: Dict[str, int] = {}
+    tokenised = [[[vocabulary.setdefault(t, len(vocabulary)) for t in terms(s)] for s in doc] for doc in documents]
+    positions = [term_positions(doc) for doc in tokenised]
+    size = max(len(vocabulary), 1)
+    document_frequency = np.zeros(size)
+    for rows, columns in positions:
+        # Each (sentence, term) pair counts once.
+        np.add.at(document_frequency, np.unique(rows * size + columns) % size, 1.0)
+    sentence_total = sum(len(doc) for doc in documents)
+    idf = np.log((1 + sentence_total) / (1 + document_frequency)) + 1.0
+
+    summaries = []
+    for sentences, (rows, columns), count in zip(documents, positions, counts):
+        if len(sentences) <= count:
+            summaries.append(" ".join(sentences))
+            continue
+        local, inverse = np.unique(columns, return_inverse=True)
+        matrix = np.zeros((len(sentences), max(len(local), 1)))
+        np.add.at(matrix, (rows, inverse), 1.0)
+        if len(local):
+            matrix *= idf[local]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        unit = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        similarity = unit @ unit.T
+
+        relevance = textrank(similarity)
+        # Lead sentences carry most news; fragments and headings carry little.
+        relevance *= 1.0 + 1.0 / (1.0 + np.arange(len(sentences)))
+        relevance[np.array([len(s) < MIN_SENTENCE_CHARS for s in sentences])] *= 0.1
+        relevance /= relevance.max()
+        summaries.append(" ".join(sentences[i] for i in select_sentences(similarity, relevance, count)))
+    return summaries
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional
+
+from src.summarisation.budget import estimate_tokens
+from src.summarisation.provider import SummaryProvider, SummaryRequest
+
+# Rough allowance for the prompt scaffolding and the reply on top of the content.
+REQUEST_OVERHEAD_TOKENS = 400
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    concurrency: int = 1
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._available = self.capacity
+        self._updated = clock()
+
+    def acquire(self, amount: float = 1.0) -> float:
+        # Callers reserve in arrival order; the balance may go negative and
+        # each caller sleeps until its own reservation is paid back.
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = self.clock()
+            self._available = min(self.capacity, self._available + (now - self._updated) * self.rate)
+            self._updated = now
+            self._available -= amount
+            wait = -self._available / self.rate if self._available < 0 else 0.0
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    def __init__(self, limits: ProviderLimits) -> None:
+        self.limits = limits
+        self._slots = threading.BoundedSemaphore(max(limits.concurrency, 1))
+        self._requests = TokenBucket(limits.requests_per_minute) if limits.requests_per_minute > 0 else None
+        self._tokens = TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute > 0 else None
+
+    @contextmanager
+    def slot(self, tokens: int) -> Iterator[None]:
+        with self._slots:
+            if self._requests:
+                self._requests.acquire()
+            if self._tokens:
+                self._tokens.acquire(tokens)
+            yield
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(name: str, limits: ProviderLimits) -> RateLimiter:
+    # Shared per provider so overlapping builds in one process respect the same limits.
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None or limiter.limits != limits:
+            limiter = _limiters[name] = RateLimiter(limits)
+        return limiter
+
+
+class RateLimitedProvider:
+    def __init__(self, provider: SummaryProvider, limits: ProviderLimits) -> None:
+        self.provider = provider
+        self.name = provider.name
+        self.limits = limits
+        self.limiter = limiter_for(provider.name, limits)
+
+    def summarize(self, request: SummaryRequest) -> str:
+        with self.limiter.slot(estimate_tokens(request.content) + REQUEST_OVERHEAD_TOKENS):
+            return self.provider.summarize(request)
+
+    def complete(self, system: Optional[str], prompt: str, json_output: bool = False) -> str:
+        with self.limiter.slot(estimate_tokens((system or "") + prompt) + REQUEST_OVERHEAD_TOKENS):
+            return self.provider.complete(system, prompt, json_output=json_output)
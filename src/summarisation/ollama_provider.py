@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-import requests
+from typing import Optional
 
 from src.summarisation.prompts import SUMMARY_TEMPLATE
 from src.summarisation.provider import SummaryProvider, SummaryRequest
+from src.utils.http import RetryPolicy, get_client, host_of
+
+OLLAMA_RETRY = RetryPolicy(attempts=2, wait_min=1.0, wait_max=5.0, retry_statuses=(500, 502, 503))
 
 
 class OllamaProvider(SummaryProvider):
-    def __init__(self, base_url: str, model: str) -> None:
+    def __init__(self, base_url: str, model: str, pool_size: int = 4) -> None:
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.name = f"ollama:{model}"
+        self.client = get_client()
+        self.client.configure_host(host_of(self.base_url), pool_size)
 
     def summarize(self, request: SummaryRequest) -> str:
         prompt = SUMMARY_TEMPLATE.format(
@@ -20,10 +25,19 @@ class OllamaProvider(SummaryProvider):
             language=request.language,
             content=request.content,
         )
-        response = requests.post(
+        return self.complete(None, prompt)
+
+    def complete(self, system: Optional[str], prompt: str, json_output: bool = False) -> str:
+        payload = {"model": self.model, "prompt": prompt, "stream": False}
+        if system:
+            payload["system"] = system
+        if json_output:
+            payload["format"] = "json"
+        response = self.client.post(
             f"{self.base_url}/api/generate",
-            json={"model": self.model, "prompt": prompt, "stream": False},
+            json=payload,
             timeout=60,
+            retry=OLLAMA_RETRY,
         )
         response.raise_for_status()
         data = response.json()
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-import requests
+from typing import Optional
 
 from src.summarisation.prompts import SUMMARY_SYSTEM, SUMMARY_TEMPLATE
 from src.summarisation.provider import SummaryProvider, SummaryRequest
+from src.utils.http import RetryPolicy, get_client, host_of
+
+OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+OPENAI_RETRY = RetryPolicy(attempts=4, wait_min=2.0, wait_max=30.0)
 
 
 class OpenAIProvider(SummaryProvider):
-    def __init__(self, api_key: str, model: str) -> None:
+    def __init__(self, api_key: str, model: str, pool_size: int = 4) -> None:
         self.api_key = api_key
         self.model = model
         self.name = f"openai:{model}"
+        self.client = get_client()
+        self.client.configure_host(host_of(OPENAI_URL), pool_size)
 
     def summarize(self, request: SummaryRequest) -> str:
         prompt = SUMMARY_TEMPLATE.format(
@@ -20,18 +26,20 @@ class OpenAIProvider(SummaryProvider):
             language=request.language,
             content=request.content,
         )
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
+        return self.complete(SUMMARY_SYSTEM, prompt)
+
+    def complete(self, system: Optional[str], prompt: str, json_output: bool = False) -> str:
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        payload = {"model": self.model, "messages": messages, "temperature": 0.2}
+        if json_output:
+            payload["response_format"] = {"type": "json_object"}
+        response = self.client.post(
+            OPENAI_URL,
             headers={"Authorization": f"Bearer {self.api_key}"},
-            json={
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": SUMMARY_SYSTEM},
-                    {"role": "user", "content": prompt},
-                ],
-                "temperature": 0.2,
-            },
+            json=payload,
             timeout=60,
+            retry=OPENAI_RETRY,
         )
         response.raise_for_status()
         data = response.json()
@@ -1,3 +1,6 @@
+# Bump when the prompts change so cached summaries are not reused.
+PROMPT_VERSION = 1
+
 SUMMARY_SYSTEM = "You are a helpful assistant that writes factual newsletter summaries."
 
 SUMMARY_TEMPLATE = """
@@ -11,3 +14,16 @@ Content:
 
 Write a concise summary. If there are important links in the content, mention them in the summary.
 """
+
+BATCH_SUMMARY_TEMPLATE = """
+Style: {style}
+Length: {length}
+Tone: {tone}
+Language: {language}
+
+Items (JSON list of objects with "id" and "content"):
+{items}
+
+Write a concise summary of each item's content on its own. If there are important links in an item, mention them in
+its summary. Reply with only a JSON object mapping each item id to its summary string.
+"""
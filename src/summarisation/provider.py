@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol
+from typing import List, Optional, Protocol
+
+from src.summarisation.extractive import summarize_texts
 
 
 @dataclass
@@ -13,12 +15,25 @@ class SummaryRequest:
     content: str
 
 
+def request_for_rules(summary_rules: dict, content: str) -> SummaryRequest:
+    return SummaryRequest(
+        style=summary_rules.get("style", "bullets"),
+        length=summary_rules.get("length", "medium"),
+        tone=summary_rules.get("tone", "factual"),
+        language=summary_rules.get("language", "en-GB"),
+        content=content,
+    )
+
+
 class SummaryProvider(Protocol):
     name: str
 
     def summarize(self, request: SummaryRequest) -> str:
         ...
 
+    def complete(self, system: Optional[str], prompt: str, json_output: bool = False) -> str:
+        ...
+
 
 def length_to_sentences(length: str) -> int:
     if length == "short":
@@ -29,7 +44,10 @@ def length_to_sentences(length: str) -> int:
 
 
 def simple_summarize(request: SummaryRequest) -> str:
-    sentences = request.content.split(".")
-    count = length_to_sentences(request.length)
-    picked = ".".join([s.strip() for s in sentences if s.strip()][:count])
-    return picked.strip()
+    return simple_summarize_batch([request])[0]
+
+
+def simple_summarize_batch(requests: List[SummaryRequest]) -> List[str]:
+    return summarize_texts(
+        [request.content for request in requests], [length_to_sentences(request.length) for request in requests]
+    )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import delete, select
+
+from src.db.models import Item, SummaryJob
+from src.summarisation.provider import SummaryRequest, request_for_rules
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_BATCH = 50
+SUMMARY_RULE_KEYS = ("style", "length", "tone", "language")
+
+
+def rules_by_source(newsletters: List[dict], templates: List[dict]) -> Dict[str, List[dict]]:
+    # Distinct summary rules of the templates used by each source's newsletters.
+    template_rules = {t["template_id"]: t.get("summary_rules", {}) for t in templates}
+    result: Dict[str, Dict[tuple, dict]] = {}
+    for newsletter in newsletters:
+        rules = template_rules.get(newsletter.get("template_id"))
+        if rules is None:
+            continue
+        identity = tuple(rules.get(key) for key in SUMMARY_RULE_KEYS)
+        for source_id in newsletter.get("sources", []):
+            result.setdefault(source_id, {})[identity] = rules
+    return {source_id: list(rules.values()) for source_id, rules in result.items()}
+
+
+def summarize_pending(
+    session,
+    summarize: Callable[[List[SummaryRequest]], List[str]],
+    source_rules: Dict[str, List[dict]],
+    limit: int = DEFAULT_QUEUE_BATCH,
+) -> int:
+    # Summaries land in the summary cache, where build_newsletter finds them.
+    started = time.monotonic()
+    jobs = session.execute(select(SummaryJob.id, SummaryJob.item_id).order_by(SummaryJob.id).limit(limit)).all()
+    if not jobs:
+        return 0
+    items = session.execute(
+        select(Item.source_id, Item.content_text)
+        .where(Item.id.in_([job.item_id for job in jobs]))
+        .order_by(Item.id)
+    ).all()
+    requests = [
+        request_for_rules(rules, item.content_text)
+        for item in items
+        for rules in source_rules.get(item.source_id, [])
+    ]
+    if requests:
+        summarize(requests)
+    session.execute(delete(SummaryJob).where(SummaryJob.id.in_([job.id for job in jobs])))
+    logger.info(
+        "Summary queue: %s items, %s summaries in %.2fs", len(jobs), len(requests), time.monotonic() - started
+    )
+    return len(jobs)
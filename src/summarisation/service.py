@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from src.summarisation.batch import DEFAULT_BATCH_TOKENS, pack_batches, summarize_batch
+from src.summarisation.budget import TokenBudget
+from src.summarisation.cache import SummaryCache, summary_key
+from src.summarisation.provider import SummaryProvider, SummaryRequest, simple_summarize, simple_summarize_batch
+
+logger = logging.getLogger(__name__)
+
+
+def summarize_one(provider: SummaryProvider, rank: int, request: SummaryRequest) -> Tuple[str, bool]:
+    started = time.monotonic()
+    try:
+        summary, ok = provider.summarize(request), True
+    except Exception as exc:
+        logger.warning("Summary for item %s failed, using simple summary: %s", rank, exc)
+        summary, ok = simple_summarize(request), False
+    logger.info("Summarised item %s in %.2fs", rank, time.monotonic() - started)
+    return summary, ok
+
+
+def summarize_misses(
+    pool: ThreadPoolExecutor,
+    provider: SummaryProvider,
+    misses: Dict[str, Tuple[int, SummaryRequest]],
+    batch_size: int,
+    batch_tokens: int,
+    budget: Optional[TokenBudget],
+) -> Dict[str, Tuple[str, bool]]:
+    results: Dict[str, Tuple[str, bool]] = {}
+    prepared: Dict[str, Tuple[int, SummaryRequest]] = {}
+    chunked: Dict[str, List[Future]] = {}
+    for key, (rank, request) in misses.items():
+        parts = budget.plan(request.content) if budget else [request.content]
+        if len(parts) == 1:
+            prepared[key] = (rank, replace(request, content=parts[0]))
+            continue
+        # Map: chunks are summarised alongside everything else; reduce below.
+        logger.info("Item %s split into %s chunks", rank, len(parts))
+        chunked[key] = [pool.submit(summarize_one, provider, rank, replace(request, content=part)) for part in parts]
+
+    entries = [(key, request) for key, (_, request) in prepared.items()]
+    batches = pack_batches(entries, batch_size, batch_tokens) if batch_size > 1 else [[entry] for entry in entries]
+    singles = [batch[0][0] for batch in batches if len(batch) == 1]
+    per_item = {key: pool.submit(summarize_one, provider, *prepared[key]) for key in singles}
+    batched = [
+        (batch, pool.submit(summarize_batch, provider, [request for _, request in batch]))
+        for batch in batches
+        if len(batch) > 1
+    ]
+    merges = {}
+    for key, futures in chunked.items():
+        rank, request = misses[key]
+        parts = [future.result() for future in futures]
+        merged = replace(request, content="\n\n".join(summary for summary, _ in parts))
+        merges[key] = (all(ok for _, ok in parts), pool.submit(summarize_one, provider, rank, merged))
+    for batch, future in batched:
+        for (key, _), summary in zip(batch, future.result()):
+            if summary is None:
+                per_item[key] = pool.submit(summarize_one, provider, *prepared[key])
+            else:
+                results[key] = (summary, True)
+    for key, future in per_item.items():
+        results[key] = future.result()
+    for key, (chunks_ok, future) in merges.items():
+        summary, ok = future.result()
+        results[key] = (summary, ok and chunks_ok)
+    return results
+
+
+def summarize_requests(
+    session,
+    provider: Optional[SummaryProvider],
+    requests: List[SummaryRequest],
+    max_workers: int = 1,
+    batch_size: int = 1,
+    batch_tokens: int = DEFAULT_BATCH_TOKENS,
+    budget: Optional[TokenBudget] = None,
+) -> List[str]:
+    if provider is None:
+        return simple_summarize_batch(requests)
+
+    started = time.monotonic()
+    cache = SummaryCache(session)
+    keys = [summary_key(provider.name, request) for request in requests]
+    summaries = cache.get_many(keys)
+
+    misses = {}
+    for rank, (key, request) in enumerate(zip(keys, requests), start=1):
+        if key not in summaries and key not in misses:
+            misses[key] = (rank, request)
+    failed = 0
+    if misses:
+        # Workers only call the provider; the session stays on this thread.
+        workers = max(1, min(max_workers, len(misses)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary") as pool:
+            results = summarize_misses(pool, provider, misses, batch_size, batch_tokens, budget)
+        for key, (summary, ok) in results.items():
+            summaries[key] = summary
+            if ok:
+                cache.put(key, provider.name, summary)
+            else:
+                failed += 1
+
+    logger.info(
+        "Summarised %s items in %.2fs: cache hits=%s misses=%s hit_rate=%.0f%% fallbacks=%s",
+        len(requests),
+        time.monotonic() - started,
+        cache.stats.hits,
+        cache.stats.misses,
+        cache.stats.hit_rate * 100,
+        failed,
+    )
+    return [summaries[key] for key in keys]
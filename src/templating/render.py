@@ -1,29 +1,59 @@
 from __future__ import annotations
 
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from urllib.parse import quote
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
 from src.tracking.tokens import build_token
 
 
-def create_env(template_dir: Path) -> Environment:
+_environments: Dict[str, Environment] = {}
+_environments_lock = threading.Lock()
+_bytecode_dir: Optional[str] = None
+
+
+def configure_template_cache(bytecode_dir: Optional[str]) -> None:
+    # None or "" uses Jinja's default per-user directory under the system temp dir.
+    global _bytecode_dir
+    with _environments_lock:
+        _bytecode_dir = bytecode_dir or None
+        _environments.clear()
+
+
+def create_env(template_dir: Path, bytecode_cache: Optional[BytecodeCache] = None) -> Environment:
     return Environment(
         loader=FileSystemLoader(str(template_dir)),
         autoescape=select_autoescape(["html", "xml"]),
+        bytecode_cache=bytecode_cache,
+        auto_reload=True,
     )
 
 
+def get_env(template_dir: Path) -> Environment:
+    # One environment per template directory and process: templates compile
+    # once (or load from the bytecode cache) and are recompiled when the file
+    # changes on disk.
+    key = str(Path(template_dir).resolve())
+    with _environments_lock:
+        env = _environments.get(key)
+        if env is None:
+            if _bytecode_dir:
+                Path(_bytecode_dir).mkdir(parents=True, exist_ok=True)
+            env = _environments[key] = create_env(Path(key), FileSystemBytecodeCache(_bytecode_dir))
+        return env
+
+
 def render_newsletter(
     template_dir: Path,
     template_html: str,
     template_text: str,
     data: Dict[str, Any],
 ) -> tuple[str, str]:
-    env = create_env(template_dir)
+    env = get_env(template_dir)
     html_tpl = env.get_template(template_html)
     text_tpl = env.get_template(template_text)
     return html_tpl.render(**data), text_tpl.render(**data)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy import select
+
+from src.db.models import EmailSent, EngagementDaily, Event, Item, NewsletterRunItem, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+SOURCE = "source"
+DOMAIN = "domain"
+SENDS_WATERMARK = "engagement_sends"
+EVENTS_WATERMARK = "engagement_events"
+# Rows younger than this are left for the next run, so sends still in flight
+# and ids committed slightly out of order are not skipped by the watermark.
+DEFAULT_LAG_SECONDS = 300
+BATCH_SIZE = 5000
+
+COUNTERS = ("sends", "opens", "clicks")
+RollupKey = Tuple[date, str, str]
+
+
+def link_domain(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+@dataclass
+class RunLinks:
+    sources: Set[str] = field(default_factory=set)
+    domains: Set[str] = field(default_factory=set)
+    link_sources: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RollupStats:
+    sends: int = 0
+    opens: int = 0
+    clicks: int = 0
+
+
+def load_run_links(session, run_ids: Iterable[int]) -> Dict[int, RunLinks]:
+    runs: Dict[int, RunLinks] = {}
+    run_ids = list(set(run_ids))
+    if not run_ids:
+        return runs
+    rows = session.execute(
+        select(NewsletterRunItem.run_id, Item.source_id, Item.url, Item.links)
+        .join(Item, Item.id == NewsletterRunItem.item_id)
+        .where(NewsletterRunItem.run_id.in_(run_ids))
+    )
+    for row in rows:
+        run = runs.setdefault(row.run_id, RunLinks())
+        run.sources.add(row.source_id)
+        for link in [row.url, *(row.links or [])]:
+            if link:
+                run.link_sources.setdefault(link, row.source_id)
+                run.domains.add(link_domain(link))
+    return runs
+
+
+def get_watermark(session, name: str) -> RollupWatermark:
+    watermark = session.query(RollupWatermark).filter(RollupWatermark.name == name).first()
+    if not watermark:
+        watermark = RollupWatermark(name=name, position=0)
+        session.add(watermark)
+    return watermark
+
+
+def new_rows(session, query, id_column, time_column, watermark: RollupWatermark, cutoff: datetime) -> List:
+    rows = []
+    while True:
+        batch = session.execute(
+            query.where(id_column > watermark.position).order_by(id_column).limit(BATCH_SIZE)
+        ).all()
+        for row in batch:
+            if getattr(row, time_column) > cutoff:
+                return rows
+            rows.append(row)
+            watermark.position = row.id
+        if len(batch) < BATCH_SIZE:
+            return rows
+
+
+def add_counts(
+    counts: Dict[RollupKey, List[int]], day: date, dimension: str, keys: Iterable[str], counter: str
+) -> None:
+    index = COUNTERS.index(counter)
+    for key in keys:
+        counts.setdefault((day, dimension, key[:255]), [0, 0, 0])[index] += 1
+
+
+def rollup_engagement(
+    session,
+    now: Optional[datetime] = None,
+    lag_seconds: int = DEFAULT_LAG_SECONDS,
+) -> RollupStats:
+    cutoff = (now or datetime.utcnow()) - timedelta(seconds=lag_seconds)
+    stats = RollupStats()
+
+    sends_watermark = get_watermark(session, SENDS_WATERMARK)
+    events_watermark = get_watermark(session, EVENTS_WATERMARK)
+    sends = new_rows(
+        session,
+        select(EmailSent.id, EmailSent.run_id, EmailSent.status, EmailSent.created_at),
+        EmailSent.id,
+        "created_at",
+        sends_watermark,
+        cutoff,
+    )
+    events = new_rows(
+        session,
+        select(Event.id, Event.type, Event.timestamp, Event.link_url, EmailSent.run_id).join(
+            EmailSent, EmailSent.id == Event.email_id
+        ),
+        Event.id,
+        "timestamp",
+        events_watermark,
+        cutoff,
+    )
+
+    runs = load_run_links(session, [row.run_id for row in sends] + [row.run_id for row in events])
+    counts: Dict[RollupKey, List[int]] = {}
+    for row in sends:
+        run = runs.get(row.run_id)
+        if row.status != "sent" or not run:
+            continue
+        day = row.created_at.date()
+        add_counts(counts, day, SOURCE, run.sources, "sends")
+        add_counts(counts, day, DOMAIN, run.domains, "sends")
+        stats.sends += 1
+    for row in events:
+        run = runs.get(row.run_id)
+        if not run:
+            continue
+        day = row.timestamp.date()
+        if row.type == "open":
+            add_counts(counts, day, SOURCE, run.sources, "opens")
+            add_counts(counts, day, DOMAIN, run.domains, "opens")
+            stats.opens += 1
+        elif row.type == "click" and row.link_url:
+            source_id = run.link_sources.get(row.link_url)
+            if source_id:
+                add_counts(counts, day, SOURCE, [source_id], "clicks")
+            add_counts(counts, day, DOMAIN, [link_domain(row.link_url)], "clicks")
+            stats.clicks += 1
+
+    apply_counts(session, counts)
+    sends_watermark.updated_at = datetime.utcnow()
+    events_watermark.updated_at = datetime.utcnow()
+    logger.info(
+        "Engagement rollup: sends=%s opens=%s clicks=%s rows=%s", stats.sends, stats.opens, stats.clicks, len(counts)
+    )
+    return stats
+
+
+def apply_counts(session, counts: Dict[RollupKey, List[int]]) -> None:
+    if not counts:
+        return
+    days = {day for day, _, _ in counts}
+    existing = {
+        (row.day, row.dimension, row.key): row
+        for row in session.execute(select(EngagementDaily).where(EngagementDaily.day.in_(days))).scalars()
+    }
+    for (day, dimension, key), (sends, opens, clicks) in counts.items():
+        row = existing.get((day, dimension, key))
+        if not row:
+            row = EngagementDaily(day=day, dimension=dimension, key=key, sends=0, opens=0, clicks=0)
+            session.add(row)
+        row.sends += sends
+        row.opens += opens
+        row.clicks += clicks
@@ -1,16 +1,231 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
 
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+from src.utils.hashing import sha256_bytes
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_HOSTS = 256
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+USER_AGENT = "newsletter-engine/0.1"
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3
+    multiplier: float = 1.0
+    wait_min: float = 2.0
+    wait_max: float = 10.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def should_retry(self, exc: BaseException) -> bool:
+        if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+            return True
+        if isinstance(exc, requests.HTTPError) and exc.response is not None:
+            return exc.response.status_code in self.retry_statuses
+        return False
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+FETCH_RETRY = RetryPolicy(attempts=3, wait_min=2.0, wait_max=10.0)
+
+
+@dataclass
+class HostStats:
+    requests: int
+    connections: int
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.connections, 0)
+
+
+class HttpClient:
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_hosts: int = DEFAULT_MAX_HOSTS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.pool_size = pool_size
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._host_adapters: Dict[str, HTTPAdapter] = {}
+        self._host_pool_sizes: Dict[str, int] = {}
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self._default_adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_size)
+        self.session.mount("http://", self._default_adapter)
+        self.session.mount("https://", self._default_adapter)
+
+    def configure_host(self, host: str, pool_size: int) -> None:
+        host = host.lower()
+        with self._lock:
+            if self._host_pool_sizes.get(host, 0) >= pool_size:
+                return
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self._host_adapters[host] = adapter
+            self._host_pool_sizes[host] = pool_size
+            for scheme in ("http", "https"):
+                self.session.mount(f"{scheme}://{host}", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        retry: RetryPolicy = NO_RETRY,
+        max_bytes: Optional[int] = None,
+        timeout: float = 20,
+        **kwargs,
+    ) -> requests.Response:
+        limit = max_bytes or self.max_bytes
+
+        def attempt() -> requests.Response:
+            response = self.session.request(method, url, timeout=timeout, stream=True, **kwargs)
+            try:
+                self._read_capped(response, limit)
+            finally:
+                response.close()
+            if response.status_code in retry.retry_statuses:
+                raise requests.HTTPError(f"{response.status_code} for url: {url}", response=response)
+            return response
+
+        retrying = Retrying(
+            stop=stop_after_attempt(retry.attempts),
+            wait=wait_exponential(multiplier=retry.multiplier, min=retry.wait_min, max=retry.wait_max),
+            retry=retry_if_exception(retry.should_retry),
+            reraise=True,
+        )
+        return retrying(attempt)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, HostStats]:
+        result: Dict[str, HostStats] = {}
+        with self._lock:
+            adapters = [self._default_adapter, *self._host_adapters.values()]
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.host}:{pool.port}" if pool.port else pool.host
+                stats = result.setdefault(host, HostStats(requests=0, connections=0))
+                stats.requests += pool.num_requests
+                stats.connections += pool.num_connections
+        return result
+
+    def log_stats(self) -> None:
+        for host, stats in sorted(self.stats().items()):
+            logger.info(
+                "HTTP pool %s: requests=%s connections=%s reused=%s",
+                host,
+                stats.requests,
+                stats.connections,
+                stats.reused,
+            )
+
+    @staticmethod
+    def _read_capped(response: requests.Response, limit: int) -> None:
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > limit:
+            raise ResponseTooLarge(f"{response.url} declares {declared} bytes, limit is {limit}")
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                raise ResponseTooLarge(f"{response.url} exceeded {limit} bytes")
+            chunks.append(chunk)
+        response._content = b"".join(chunks)
+        response._content_consumed = True
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+@dataclass
+class FetchValidators:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_length: Optional[int] = None
+    body_hash: Optional[str] = None
+
+
+@dataclass
+class ConditionalResponse:
+    not_modified: bool
+    content: bytes
+    text: str
+    validators: FetchValidators
+
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
 def get_text(url: str, timeout: int = 20, headers: Optional[dict] = None) -> str:
-    response = requests.get(url, timeout=timeout, headers=headers)
+    response = get_client().get(url, retry=FETCH_RETRY, timeout=timeout, headers=headers)
     response.raise_for_status()
     return response.text
+
+
+def get_conditional(
+    url: str,
+    validators: Optional[FetchValidators] = None,
+    timeout: int = 20,
+    headers: Optional[dict] = None,
+) -> ConditionalResponse:
+    previous = validators or FetchValidators()
+    request_headers = dict(headers or {})
+    if previous.etag:
+        request_headers["If-None-Match"] = previous.etag
+    if previous.last_modified:
+        request_headers["If-Modified-Since"] = previous.last_modified
+
+    response = get_client().get(url, retry=FETCH_RETRY, timeout=timeout, headers=request_headers)
+    if response.status_code == 304:
+        return ConditionalResponse(not_modified=True, content=b"", text="", validators=previous)
+    response.raise_for_status()
+
+    content = response.content
+    current = FetchValidators(
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        content_length=len(content),
+        body_hash=sha256_bytes(content),
+    )
+    # Servers that ignore validators still send identical bytes; treat that as unchanged too.
+    not_modified = previous.body_hash is not None and previous.body_hash == current.body_hash
+    return ConditionalResponse(not_modified=not_modified, content=content, text=response.text, validators=current)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Tuple
+
+SIGNATURE_BITS = 64
+MAX_WORDS = 2000
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# Each hash bit gets its own 16-bit lane in one big integer, so summing the
+# lane integers of all features counts every bit column in a single add.
+LANE_BITS = 16
+_BYTE_LANES = [sum(((byte >> bit) & 1) << (LANE_BITS * bit) for bit in range(8)) for byte in range(256)]
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature_lanes(feature: str) -> int:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    lanes = 0
+    for position, byte in enumerate(reversed(digest)):
+        lanes |= _BYTE_LANES[byte] << (8 * LANE_BITS * position)
+    return lanes
+
+
+def simhash(text: str) -> Optional[int]:
+    # Single words rather than shingles: syndicated copies of short news items
+    # mostly differ by a prefix or footer, which shingles amplify.
+    features = set(_WORD_RE.findall(text.lower())[:MAX_WORDS])
+    if not features:
+        return None
+
+    total = sum(_feature_lanes(feature) for feature in features)
+    counts = struct.unpack(f"<{SIGNATURE_BITS}H", total.to_bytes(SIGNATURE_BITS * LANE_BITS // 8, "little"))
+    half = len(features) / 2
+    signature = 0
+    for bit, count in enumerate(counts):
+        if count > half:
+            signature |= 1 << bit
+    return signature
+
+
+def signature_hex(signature: int) -> str:
+    return f"{signature:016x}"
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class SimHashIndex:
+    def __init__(self, max_distance: int = 3) -> None:
+        # With max_distance + 1 bands, any two signatures within max_distance
+        # share at least one band exactly, so bucket lookups miss nothing.
+        self.max_distance = max_distance
+        self.bands = min(max_distance + 1, SIGNATURE_BITS)
+        self.band_bits = SIGNATURE_BITS // self.bands
+        self._mask = (1 << self.band_bits) - 1
+        self._buckets: Dict[Tuple[int, int], List[Hashable]] = defaultdict(list)
+        self._signatures: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: int) -> List[Tuple[int, int]]:
+        return [(band, (signature >> (band * self.band_bits)) & self._mask) for band in range(self.bands)]
+
+    def add(self, key: Hashable, signature: int) -> None:
+        self._signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].append(key)
+
+    def near(self, signature: int) -> List[Hashable]:
+        matches: List[Hashable] = []
+        checked = set()
+        for band_key in self._band_keys(signature):
+            for key in self._buckets.get(band_key, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                if hamming(signature, self._signatures[key]) <= self.max_distance:
+                    matches.append(key)
+        return matches
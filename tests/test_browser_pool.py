@@ -0,0 +1,63 @@
+import importlib.util
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.ingestion.browser_pool import BrowserPool
+
+HAS_PLAYWRIGHT = importlib.util.find_spec("playwright") is not None
+
+PAGE = """<!doctype html>
+<html><head><title>Static</title></head>
+<body><main><p>Hello from the stand-in server</p><img src="/logo.png" /></main></body></html>
+"""
+
+
+class RecordingHandler(SimpleHTTPRequestHandler):
+    requested = []
+
+    def do_GET(self):
+        RecordingHandler.requested.append(self.path)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipUnless(HAS_PLAYWRIGHT, "playwright not installed")
+class BrowserPoolTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = Path(cls.tmp.name)
+        (root / "index.html").write_text(PAGE, encoding="utf-8")
+        (root / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+        handler = partial(RecordingHandler, directory=cls.tmp.name)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/index.html"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp.cleanup()
+
+    def test_fetch_blocks_images_and_recycles(self):
+        RecordingHandler.requested.clear()
+        pool = BrowserPool(max_pages=2, block_resources=True, recycle_after=2)
+        try:
+            for _ in range(3):
+                self.assertIn("Hello from the stand-in server", pool.fetch(self.url))
+        finally:
+            pool.close()
+
+        self.assertEqual(pool.launches, 2)
+        self.assertNotIn("/logo.png", RecordingHandler.requested)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src import cli
+from src.db.models import Base, Item, Source
+from src.ingestion.normalise import ItemData
+
+SOURCE = {"source_id": "cli-a", "type": "rss", "params": {"feed_url": "https://a.example/feed"}}
+SETTINGS = SimpleNamespace(
+    config_dir="config",
+    ingest_batch_size=10,
+    ingest_flush_seconds=0.1,
+    ingest_queue_size=10,
+    summary_provider="none",
+    openai_api_key=None,
+)
+
+
+class FakeLoader:
+    def __init__(self, config_dir):
+        pass
+
+    def load_sources(self):
+        return {"sources": [SOURCE]}
+
+
+class PollSourceTests(unittest.TestCase):
+    def setUp(self):
+        # The ingest writer runs on its own thread, so the database shares one connection.
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        with self.Session() as session:
+            session.add(Source(source_id="cli-a", type="rss", params={}))
+            session.commit()
+
+        now = datetime.now(timezone.utc)
+        items = [ItemData("cli-a", f"T{i}", "text", None, now, now, [], f"cli{i}") for i in range(2)]
+        self.save_state = mock.Mock()
+        self.fetch = mock.Mock(return_value=(items, self.save_state))
+        for target, value in [
+            ("get_session", self.Session),
+            ("load_settings", lambda: SETTINGS),
+            ("ConfigLoader", FakeLoader),
+            ("fetch_source_items", self.fetch),
+        ]:
+            patcher = mock.patch.object(cli, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def last_polled(self):
+        with self.Session() as session:
+            return session.query(Source.last_polled_at).filter(Source.source_id == "cli-a").scalar()
+
+    def test_poll_source_saves_state_after_storing(self):
+        self.assertEqual(cli.poll_source("cli-a"), 2)
+        with self.Session() as session:
+            self.assertEqual(session.query(Item).filter(Item.source_id == "cli-a").count(), 2)
+        self.save_state.assert_called_once_with()
+        self.assertIsNotNone(self.last_polled())
+
+    def test_failed_store_keeps_source_state(self):
+        with mock.patch.object(cli, "store_items", side_effect=RuntimeError("db down")):
+            self.assertEqual(cli.poll_source("cli-a"), 0)
+        self.save_state.assert_not_called()
+        self.assertIsNone(self.last_polled())
+
+    def test_busy_source_is_skipped(self):
+        lock = cli.source_poll_lock("cli-a")
+        with lock:
+            self.assertEqual(cli.poll_source("cli-a"), 0)
+        self.fetch.assert_not_called()
+        self.save_state.assert_not_called()
+        self.assertIsNone(self.last_polled())
+
+    def test_poll_source_command(self):
+        with (
+            mock.patch.object(cli, "configure_logging"),
+            mock.patch.object(cli, "load_settings"),
+            mock.patch.object(cli, "init_engine"),
+            mock.patch.object(cli, "configure_browser_pool"),
+            mock.patch.object(cli, "configure_template_cache"),
+            mock.patch.object(cli, "poll_source") as poll_source,
+            mock.patch("sys.argv", ["cli", "poll-source", "--source-id", "cli-a"]),
+        ):
+            cli.main()
+        poll_source.assert_called_once_with("cli-a")
+
+
+class PollJobTests(unittest.TestCase):
+    def test_one_job_per_enabled_source(self):
+        now = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+        sources = [
+            {"source_id": "fresh", "poll_interval_minutes": 15},
+            {"source_id": "stale", "poll_interval_minutes": 15},
+            {"source_id": "new"},
+            {"source_id": "off", "enabled": False},
+        ]
+        last_polled = {"fresh": datetime(2024, 5, 1, 11, 55), "stale": datetime(2024, 5, 1, 9, 0), "new": None}
+        scheduler = BackgroundScheduler(timezone="UTC")
+        cli.add_poll_jobs(scheduler, sources, last_polled, now, jitter_seconds=60)
+
+        jobs = {job.id: job for job in scheduler.get_jobs()}
+        self.assertEqual(sorted(jobs), ["poll-source:fresh", "poll-source:new", "poll-source:stale"])
+        self.assertEqual(jobs["poll-source:fresh"].trigger.interval, timedelta(minutes=15))
+        self.assertEqual(jobs["poll-source:new"].trigger.interval, timedelta(minutes=60))
+        self.assertEqual(jobs["poll-source:new"].args, ("new",))
+        # Each source resumes its own interval from its last poll, plus jitter.
+        due = {"fresh": now + timedelta(minutes=10), "stale": now, "new": now}
+        for source_id, expected in due.items():
+            first_run = jobs[f"poll-source:{source_id}"].next_run_time
+            self.assertLessEqual(expected, first_run)
+            self.assertLessEqual(first_run, expected + timedelta(seconds=60))
+
+
+if __name__ == "__main__":
+    unittest.main()
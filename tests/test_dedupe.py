@@ -1,19 +1,32 @@
 import unittest
-from src.ingestion.dedupe import dedupe_items
-from src.ingestion.normalise import ItemData
-from src.utils.time import now_utc
+from src.db.models import Item
+from src.db.session import get_session, init_engine
+from src.ingestion.normalise import normalise_from_rss, rss_fingerprint
+from src.ingestion.seen import FingerprintIndex
 
 
 class DedupeTests(unittest.TestCase):
-    def test_dedupe_items(self):
-        now = now_utc()
-        items = [
-            ItemData("s1", "A", "text", "url1", None, now, [], "fp1"),
-            ItemData("s1", "B", "text", "url1", None, now, [], "fp1"),
-            ItemData("s2", "C", "text", "url2", None, now, [], "fp2"),
-        ]
-        result = dedupe_items(items)
-        self.assertEqual(len(result), 2)
+    def test_rss_fingerprint_matches_normalised_item(self):
+        with_url = {"title": "A", "link": "https://example.com/a", "summary": "<p>x</p>"}
+        without_url = {"title": "B", "content": [{"value": "<p>Body</p>"}]}
+        for entry in (with_url, without_url):
+            self.assertEqual(rss_fingerprint(entry), normalise_from_rss("s1", entry, True).fingerprint)
+
+    def test_fingerprint_index(self):
+        init_engine("sqlite:///:memory:")
+        entry = {"title": "A", "link": "https://example.com/seen"}
+        with get_session() as session:
+            session.add(Item(source_id="seen-src", content_text="x", fingerprint=rss_fingerprint(entry)))
+            session.commit()
+
+        index = FingerprintIndex()
+        seen = index.view("seen-src")
+        self.assertIn(rss_fingerprint(entry), seen)
+        self.assertNotIn(rss_fingerprint({"link": "https://example.com/new"}), seen)
+
+        index.add("seen-src", [rss_fingerprint({"link": "https://example.com/new"})])
+        self.assertIn(rss_fingerprint({"link": "https://example.com/new"}), seen)
+        self.assertNotIn(rss_fingerprint(entry), index.view("other-src"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+import unittest
+
+from src.summarisation.extractive import split_sentences, summarize_texts
+from src.summarisation.provider import SummaryRequest, simple_summarize
+
+
+class ExtractiveTests(unittest.TestCase):
+    def test_split_sentences(self):
+        text = (
+            "Dr. Smith said growth was 3.5% in the U.S. last year. See https://example.com/a.b for details! "
+            "Prices rose, e.g. for energy. Was it expected? Analysts think so...\n"
+            "- A bullet without a full stop\n"
+            "J. R. Hartley wrote a book. We chose plan B. Then we left."
+        )
+        self.assertEqual(
+            split_sentences(text),
+            [
+                "Dr. Smith said growth was 3.5% in the U.S. last year.",
+                "See https://example.com/a.b for details!",
+                "Prices rose, e.g. for energy.",
+                "Was it expected?",
+                "Analysts think so...",
+                "- A bullet without a full stop",
+                "J. R. Hartley wrote a book.",
+                "We chose plan B.",
+                "Then we left.",
+            ],
+        )
+
+    def test_picks_central_sentences_without_repeats(self):
+        text = (
+            "The city council approved a new cycling plan on Tuesday. "
+            "The cycling plan adds forty kilometres of protected cycling lanes across the city. "
+            "The council approved the new cycling plan on Tuesday evening. "
+            "Local bakeries reported strong sales of croissants. "
+            "Protected lanes will connect the city centre with the university campus. "
+            "Subscribe for more."
+        )
+        summary = summarize_texts([text], [2])[0]
+        self.assertEqual(
+            summary,
+            "The city council approved a new cycling plan on Tuesday. "
+            "The cycling plan adds forty kilometres of protected cycling lanes across the city.",
+        )
+
+    def test_short_and_empty_items(self):
+        texts = ["", "One sentence only.", "!!!"]
+        self.assertEqual(summarize_texts(texts, [2, 2, 2]), texts)
+
+    def test_simple_summarize_uses_length(self):
+        topics = ["rail strikes", "housing prices", "school meals", "river flooding", "museum funding", "bus fares"]
+        text = " ".join(f"The report covers {topic} and what changes next." for topic in topics)
+        request = SummaryRequest("bullets", "short", "factual", "en-GB", text)
+        self.assertEqual(len(split_sentences(simple_summarize(request))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
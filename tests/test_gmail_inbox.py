@@ -0,0 +1,211 @@
+import base64
+import re
+import unittest
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from src.ingestion.gmail_inbox import sync_gmail
+from src.utils.hashing import sha256_text
+
+
+def encode(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii")
+
+
+class FakeRequest:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append(len(self.requests))
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except HttpError as exc:
+                self.callback(request_id, None, exc)
+
+
+class FakeGmailService:
+    def __init__(self, messages, history_id="100", page_size=2):
+        self.inbox = messages
+        self.history_id = history_id
+        self.history_records = []
+        self.page_size = page_size
+        self.expired_history = False
+        self.gets = []
+        self.batches = []
+        self.listed = []
+        self.failing = set()
+
+    def users(self):
+        return self
+
+    def getProfile(self, userId):
+        return FakeRequest(lambda: {"historyId": self.history_id})
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def messages(self):
+        return FakeMessages(self)
+
+    def history(self):
+        return FakeHistory(self)
+
+    def deliver(self, message):
+        self.inbox.insert(0, message)
+        self.history_id = str(int(self.history_id) + 1)
+        self.history_records.append({"messagesAdded": [{"message": {"id": message["id"]}}]})
+
+
+class FakeMessages:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, userId, q, pageToken=None):
+        def run():
+            label, after = re.fullmatch(r"\(?(\w+)\)?(?: after:(-?\d+))?", q).groups()
+            matching = [m for m in self.service.inbox if label in m["labels"] and m["sent"] > int(after or 0)]
+            start = int(pageToken or 0)
+            page = matching[start : start + self.service.page_size]
+            self.service.listed.extend(m["id"] for m in page)
+            response = {"messages": [{"id": m["id"]} for m in page]}
+            if start + self.service.page_size < len(matching):
+                response["nextPageToken"] = str(start + self.service.page_size)
+            return response
+
+        return FakeRequest(run)
+
+    def get(self, userId, id, format, metadataHeaders=None):
+        def run():
+            self.service.gets.append((id, format))
+            if (id, format) in self.service.failing:
+                raise HttpError(httplib2.Response({"status": 500}), b"")
+            message = next(m for m in self.service.inbox if m["id"] == id)
+            headers = [{"name": "From", "value": message["from"]}, {"name": "Subject", "value": message["subject"]}]
+            payload = {"headers": headers}
+            if format == "full":
+                payload["parts"] = [{"mimeType": "text/html", "body": {"data": encode(message["html"])}}]
+            return {"id": id, "internalDate": str(message["sent"] * 1000), "payload": payload}
+
+        return FakeRequest(run)
+
+
+class FakeHistory:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, userId, startHistoryId, historyTypes, pageToken=None):
+        def run():
+            if self.service.expired_history:
+                raise HttpError(httplib2.Response({"status": 404}), b"")
+            return {"history": self.service.history_records, "historyId": self.service.history_id}
+
+        return FakeRequest(run)
+
+
+def message(message_id, sender="news@example.com", labels="newsletters", sent=1_700_000_000):
+    return {
+        "id": message_id,
+        "from": sender,
+        "subject": f"Issue {message_id}",
+        "labels": labels,
+        "sent": sent,
+        "html": f'<p>Body {message_id}</p><a href="https://example.com/{message_id}">x</a>',
+    }
+
+
+def sync(service, **kwargs):
+    params = dict(
+        source_id="gmail",
+        gmail_query="newsletters",
+        allowed_senders=None,
+        allowed_domains=["example.com"],
+        parse_mode="html",
+        extract_links=True,
+    )
+    params.update(kwargs)
+    return sync_gmail(service, **params)
+
+
+class GmailSyncTests(unittest.TestCase):
+    def test_full_sync_pages_and_prefilters_senders(self):
+        service = FakeGmailService(
+            [message("m1"), message("m2", sender="spam@other.org"), message("m3"), message("m4", labels="other")]
+        )
+        items, history_id = sync(service)
+
+        self.assertEqual([i.title for i in items], ["Issue m1", "Issue m3"])
+        self.assertEqual(items[0].links, ["https://example.com/m1"])
+        self.assertEqual(history_id, "100")
+        full_gets = [mid for mid, fmt in service.gets if fmt == "full"]
+        self.assertEqual(full_gets, ["m1", "m3"])
+
+    def test_incremental_sync_only_fetches_new_messages(self):
+        service = FakeGmailService([message(f"old{i}") for i in range(10)])
+        _, history_id = sync(service)
+        service.gets.clear()
+        service.listed.clear()
+
+        service.deliver(message("m3", sent=1_700_000_100))
+        service.deliver(message("m4", labels="other", sent=1_700_000_200))
+        items, new_history_id = sync(service, history_id=history_id)
+
+        self.assertEqual([i.title for i in items], ["Issue m3"])
+        self.assertEqual(new_history_id, "102")
+        self.assertNotIn("old1", [mid for mid, _ in service.gets])
+        # The listing that applies the query stops at the oldest new message.
+        self.assertEqual(service.listed, ["m3"])
+        self.assertEqual(service.gets, [("m3", "metadata"), ("m4", "metadata"), ("m3", "full")])
+
+    def test_no_history_changes_skips_listing(self):
+        service = FakeGmailService([message("m1")])
+        items, _ = sync(service, history_id="100")
+        self.assertEqual(items, [])
+        self.assertEqual(service.gets, [])
+
+    def test_expired_history_falls_back_to_known_fingerprints(self):
+        service = FakeGmailService([message("m1"), message("m2")])
+        service.expired_history = True
+        items, _ = sync(service, history_id="1", known_fingerprints={sha256_text("m1")})
+        self.assertEqual([i.title for i in items], ["Issue m2"])
+
+    def test_failed_get_keeps_history_id(self):
+        service = FakeGmailService([message("m1")])
+        _, history_id = sync(service)
+        service.deliver(message("m2", sent=1_700_000_100))
+        service.deliver(message("m3", sent=1_700_000_200))
+        service.failing.add(("m3", "full"))
+
+        items, new_history_id = sync(service, history_id=history_id)
+        self.assertEqual([i.title for i in items], ["Issue m2"])
+        self.assertEqual(new_history_id, history_id)
+
+        service.failing.clear()
+        items, new_history_id = sync(service, history_id=history_id, known_fingerprints={sha256_text("m2")})
+        self.assertEqual([i.title for i in items], ["Issue m3"])
+        self.assertEqual(new_history_id, "102")
+
+    def test_gets_are_batched(self):
+        service = FakeGmailService([message(f"m{i}") for i in range(120)], page_size=100)
+        items, _ = sync(service, allowed_domains=None)
+        self.assertEqual(len(items), 120)
+        self.assertEqual(service.batches, [50, 50, 20])
+
+
+if __name__ == "__main__":
+    unittest.main()
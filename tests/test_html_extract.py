@@ -0,0 +1,33 @@
+import unittest
+
+from bs4 import BeautifulSoup
+
+from src.ingestion.html_extract import element_text_and_links, extract_html
+
+HTML = """<html><head><title>Digest &amp; more</title><style>p { color: red; }</style></head>
+<body><p>Hello <b>world</b></p><!-- hidden --><script>var x = 1;</script>
+<a href="https://example.com/a">A</a><a href="https://example.com/a">again</a><a>no href</a>
+<div id="main"><p>Inner&nbsp;text</p><a href="/relative">rel</a></div></body></html>"""
+
+
+class HtmlExtractTests(unittest.TestCase):
+    def test_matches_beautifulsoup_text_and_links(self):
+        parsed = extract_html(HTML)
+        soup = BeautifulSoup(HTML, "html.parser")
+        self.assertEqual(parsed.text, " ".join(soup.get_text(" ").split()))
+        self.assertEqual(parsed.links, ["https://example.com/a", "/relative"])
+        self.assertEqual(parsed.title, "Digest & more")
+
+    def test_fragment_and_empty(self):
+        self.assertEqual(extract_html("plain <i>text</i>").text, "plain text")
+        self.assertEqual(extract_html("").text, "")
+
+    def test_element_text_and_links(self):
+        soup = BeautifulSoup(HTML, "html.parser")
+        text, links = element_text_and_links(soup.select_one("#main"))
+        self.assertEqual(text, "Inner text rel")
+        self.assertEqual(links, ["/relative"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.http import FetchValidators, HttpClient, ResponseTooLarge, get_conditional
+
+BODY = b"<rss><channel><title>Feed</title></channel></rss>"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.path != "/no-validators":
+            self.send_header("ETag", '"v1"')
+            self.send_header("Last-Modified", "Wed, 01 Jan 2025 00:00:00 GMT")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServerTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+class ConditionalGetTests(ServerTestCase):
+    def test_etag_round_trip(self):
+        first = get_conditional(f"{self.base_url}/feed")
+        self.assertFalse(first.not_modified)
+        self.assertEqual(first.content, BODY)
+        self.assertEqual(first.validators.etag, '"v1"')
+        self.assertEqual(first.validators.content_length, len(BODY))
+
+        second = get_conditional(f"{self.base_url}/feed", first.validators)
+        self.assertTrue(second.not_modified)
+        self.assertEqual(second.validators, first.validators)
+
+    def test_unchanged_body_without_validators(self):
+        first = get_conditional(f"{self.base_url}/no-validators")
+        self.assertIsNone(first.validators.etag)
+        second = get_conditional(f"{self.base_url}/no-validators", first.validators)
+        self.assertTrue(second.not_modified)
+        changed = get_conditional(f"{self.base_url}/no-validators", FetchValidators(body_hash="other"))
+        self.assertFalse(changed.not_modified)
+
+
+class HttpClientTests(ServerTestCase):
+    def test_connections_reused(self):
+        client = HttpClient()
+        for _ in range(5):
+            self.assertEqual(client.get(f"{self.base_url}/feed").content, BODY)
+        stats = client.stats()[f"127.0.0.1:{self.server.server_address[1]}"]
+        self.assertEqual(stats.requests, 5)
+        self.assertEqual(stats.connections, 1)
+        self.assertEqual(stats.reused, 4)
+
+    def test_response_size_cap(self):
+        client = HttpClient(max_bytes=10)
+        with self.assertRaises(ResponseTooLarge):
+            client.get(f"{self.base_url}/feed")
+
+
+if __name__ == "__main__":
+    unittest.main()
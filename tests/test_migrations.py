@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, create_engine, inspect, select
+from sqlalchemy.pool import StaticPool
+
+from src.db.migrations import MIGRATIONS, add_column, applied_versions, explain, run_migrations
+from src.db.models import Base, Item, ItemCandidate
+from src.selection.policy import candidate_query
+from src.selection.ranker import RecencyDecayRanker, TimestampRanker
+
+
+class MigrationTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+
+    def index_names(self, table):
+        return {index["name"] for index in inspect(self.engine).get_indexes(table)}
+
+    def test_upgrades_existing_schema_once(self):
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("DROP INDEX ix_items_source_ingested")
+            connection.exec_driver_sql("DROP INDEX ix_events_type_timestamp")
+        self.assertNotIn("ix_items_source_ingested", self.index_names("items"))
+
+        applied = run_migrations(self.engine)
+        self.assertEqual([m.version for m in applied], [m.version for m in MIGRATIONS])
+        self.assertIn("ix_items_source_ingested", self.index_names("items"))
+        self.assertIn("ix_events_type_timestamp", self.index_names("events"))
+        self.assertEqual(run_migrations(self.engine), [])
+        with self.engine.connect() as connection:
+            self.assertEqual(applied_versions(connection), [m.version for m in MIGRATIONS])
+
+    def test_backfills_item_candidates(self):
+        with self.engine.begin() as connection:
+            connection.execute(
+                Item.__table__.insert().values(
+                    source_id="old", content_text="x", ingested_at=datetime(2024, 1, 1), fingerprint="f"
+                )
+            )
+        run_migrations(self.engine)
+        with self.engine.connect() as connection:
+            rows = connection.execute(select(ItemCandidate.source_id, ItemCandidate.rank_time)).all()
+        self.assertEqual(rows, [("old", datetime(2024, 1, 1))])
+
+    def test_add_column_is_idempotent(self):
+        with self.engine.begin() as connection:
+            add_column(connection, "items", Column("score", Integer, nullable=True))
+            add_column(connection, "items", Column("score", Integer, nullable=True))
+        self.assertIn("score", {c["name"] for c in inspect(self.engine).get_columns("items")})
+
+    def test_explain_uses_index(self):
+        run_migrations(self.engine)
+        statement = select(Item.id).where(Item.source_id.in_(["a", "b"]), Item.ingested_at >= "2024-01-01")
+        with self.engine.connect() as connection:
+            plan = "\n".join(explain(connection, statement))
+        self.assertIn("ix_items_source_ingested", plan)
+
+    def test_candidate_pool_reads_in_index_order(self):
+        for ranker in (TimestampRanker(), RecencyDecayRanker()):
+            statement = candidate_query(["a", "b"], datetime(2024, 1, 1), 10, ranker.source_order(["a", "b"]))
+            with self.engine.connect() as connection:
+                plan = "\n".join(explain(connection, statement))
+            self.assertIn("ix_item_candidates_source", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
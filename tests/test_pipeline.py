@@ -0,0 +1,129 @@
+import threading
+import time
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.models import Base
+from src.ingestion.normalise import ItemData
+from src.ingestion.pipeline import IngestPipeline
+from src.ingestion.store import StoreResult, insert_items
+from src.utils.time import now_utc
+
+
+def make_items(source_id, count, prefix="fp"):
+    now = now_utc()
+    return (ItemData(source_id, f"T{i}", "text", None, None, now, [], f"{prefix}{i}") for i in range(count))
+
+
+# The writer runs on its own thread, so the in-memory database has to share one connection.
+engine = create_engine(
+    "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+Session = sessionmaker(bind=engine)
+
+
+def store_items(items):
+    with Session() as session:
+        result = insert_items(session, items)
+        session.commit()
+    return result
+
+
+class IngestPipelineTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        Base.metadata.create_all(engine)
+
+    def test_batches_and_counts_per_source(self):
+        stored = []
+        with IngestPipeline(store_items, on_stored=stored.append, batch_size=10, queue_size=5) as pipeline:
+            pipeline.consume(make_items("pipe-a", 25))
+            pipeline.consume(make_items("pipe-b", 5))
+            pipeline.consume(make_items("pipe-a", 3))
+
+        self.assertEqual(pipeline.counts["pipe-a"].submitted, 28)
+        self.assertEqual(pipeline.counts["pipe-a"].inserted, 25)
+        self.assertEqual(pipeline.counts["pipe-a"].skipped, 3)
+        self.assertEqual(pipeline.counts["pipe-b"].inserted, 5)
+        self.assertEqual(pipeline.commits, 4)
+        self.assertTrue(all(len(batch) <= 10 for batch in stored))
+
+    def test_flushes_on_deadline(self):
+        flushed = threading.Event()
+
+        def store(batch):
+            flushed.set()
+            return store_items(batch)
+
+        pipeline = IngestPipeline(store, batch_size=100, flush_seconds=0.1)
+        pipeline.consume(make_items("pipe-c", 3))
+        self.assertTrue(flushed.wait(2.0))
+        pipeline.close()
+        self.assertEqual(pipeline.counts["pipe-c"].inserted, 3)
+
+    def test_queue_bounds_producer(self):
+        release = threading.Event()
+
+        def slow_store(batch):
+            release.wait(5.0)
+            return StoreResult(inserted=len(batch))
+
+        pipeline = IngestPipeline(slow_store, batch_size=1, queue_size=2)
+        producer = threading.Thread(target=pipeline.consume, args=(make_items("pipe-d", 20),))
+        producer.start()
+        time.sleep(0.2)
+        # One item is held by the blocked writer, two wait in the queue.
+        self.assertLessEqual(pipeline.counts["pipe-d"].submitted, 4)
+        release.set()
+        producer.join(5.0)
+        pipeline.close()
+        self.assertEqual(pipeline.counts["pipe-d"].submitted, 20)
+
+    def test_failed_batch_is_counted(self):
+        def broken(batch):
+            raise RuntimeError("db down")
+
+        with IngestPipeline(broken, batch_size=5) as pipeline:
+            pipeline.consume(make_items("pipe-e", 5))
+        self.assertEqual(pipeline.counts["pipe-e"].failed, 5)
+        self.assertEqual(pipeline.commits, 0)
+
+    def test_finish_waits_for_store(self):
+        saved = []
+        with IngestPipeline(store_items, batch_size=100, flush_seconds=30) as pipeline:
+            pipeline.consume(make_items("pipe-f", 3))
+            pipeline.finish("pipe-f", lambda: saved.append(pipeline.counts["pipe-f"].inserted))
+            self.assertEqual(saved, [])
+        self.assertEqual(saved, [3])
+
+        def broken(batch):
+            raise RuntimeError("db down")
+
+        with IngestPipeline(broken, batch_size=5) as pipeline:
+            pipeline.consume(make_items("pipe-g", 2))
+            pipeline.finish("pipe-g", lambda: saved.append("pipe-g"))
+        self.assertEqual(saved, [3])
+
+    def test_failed_source_does_not_fail_its_batch(self):
+        saved = []
+
+        def store(batch):
+            if any(item.source_id == "pipe-bad" for item in batch):
+                raise RuntimeError("bad row")
+            return store_items(batch)
+
+        with IngestPipeline(store, batch_size=100) as pipeline:
+            pipeline.consume(make_items("pipe-h", 3))
+            pipeline.consume(make_items("pipe-bad", 2))
+            pipeline.finish("pipe-h", lambda: saved.append("pipe-h"))
+            pipeline.finish("pipe-bad", lambda: saved.append("pipe-bad"))
+        self.assertEqual(pipeline.counts["pipe-h"].inserted, 3)
+        self.assertEqual(pipeline.counts["pipe-bad"].failed, 2)
+        self.assertEqual(saved, ["pipe-h"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import threading
+import time
+import unittest
+
+from src.ingestion.normalise import ItemData
+from src.ingestion.poller import PollTask, run_polls, source_host
+from src.utils.time import now_utc
+
+
+def make_item(source_id: str) -> ItemData:
+    return ItemData(source_id, "T", "text", None, None, now_utc(), [], f"fp-{source_id}")
+
+
+class PollerTests(unittest.TestCase):
+    def test_results_streamed_and_host_cap_respected(self):
+        lock = threading.Lock()
+        active = {"a.example": 0}
+        peak = {"a.example": 0}
+
+        def run(source_id):
+            def inner():
+                with lock:
+                    active["a.example"] += 1
+                    peak["a.example"] = max(peak["a.example"], active["a.example"])
+                time.sleep(0.05)
+                with lock:
+                    active["a.example"] -= 1
+                return [make_item(source_id)]
+
+            return inner
+
+        tasks = [PollTask(f"s{i}", "a.example", run(f"s{i}")) for i in range(6)]
+        handled = []
+        results = run_polls(
+            tasks,
+            lambda source_id, items: handled.append(source_id) or len(list(items)),
+            max_workers=6,
+            per_host_limit=2,
+        )
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(sorted(handled), sorted(t.source_id for t in tasks))
+        self.assertLessEqual(peak["a.example"], 2)
+        self.assertTrue(all(r.status == "ok" and r.items == 1 for r in results))
+
+    def test_timeout_and_error(self):
+        def slow():
+            time.sleep(3)
+            return []
+
+        def broken():
+            raise RuntimeError("boom")
+
+        tasks = [PollTask("slow", "a", slow), PollTask("broken", "b", broken)]
+        results = {r.source_id: r for r in run_polls(tasks, lambda s, i: 0, source_timeout=0.5)}
+        self.assertEqual(results["slow"].status, "timeout")
+        self.assertEqual(results["broken"].status, "error")
+
+    def test_timed_out_poll_keeps_host_slot_and_drops_late_items(self):
+        release = threading.Event()
+        finished = threading.Event()
+        started = []
+
+        def stuck():
+            try:
+                yield make_item("stuck")
+                release.wait(5)
+                yield make_item("stuck")
+            finally:
+                finished.set()
+
+        def queued():
+            started.append("queued")
+            return [make_item("queued")]
+
+        received = []
+        tasks = [PollTask("stuck", "a", stuck), PollTask("queued", "a", queued)]
+        results = run_polls(
+            tasks,
+            lambda source_id, items: len([received.append(item) for item in items]),
+            per_host_limit=1,
+            source_timeout=0.3,
+        )
+        release.set()
+        self.assertTrue(finished.wait(5))
+
+        statuses = {r.source_id: r.status for r in results}
+        self.assertEqual(statuses, {"stuck": "timeout", "queued": "skipped"})
+        self.assertEqual(started, [])
+        self.assertEqual(len(received), 1)
+
+    def test_source_host(self):
+        self.assertEqual(
+            source_host({"source_id": "x", "type": "rss", "params": {"feed_url": "https://Feeds.Example.com/a"}}),
+            "feeds.example.com",
+        )
+        self.assertEqual(source_host({"source_id": "x", "type": "gmail_inbox", "params": {}}), "gmail.googleapis.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
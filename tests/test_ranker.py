@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.selection.ranker import CandidateBatch, Ranker, RecencyDecayRanker, TimestampRanker, build_ranker, score_item
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def batch(*rows):
+    return CandidateBatch.from_rows(
+        [
+            SimpleNamespace(id=i, source_id=source_id, published_at=published, ingested_at=ingested)
+            for i, (source_id, published, ingested) in enumerate(rows, start=1)
+        ]
+    )
+
+
+class RankerTests(unittest.TestCase):
+    def test_timestamp_ranker_matches_score_item(self):
+        published = NOW - timedelta(hours=3)
+        candidates = batch(("a", published, NOW), ("b", None, NOW))
+        ranker = TimestampRanker(source_type_map={"a": "website_change", "b": "rss"})
+        scores = ranker.score(candidates)
+        self.assertAlmostEqual(scores[0], score_item(published, "website_change", ranker.type_weights))
+        self.assertEqual(scores[1], 0.0)
+
+        boosted = TimestampRanker(source_type_map=ranker.source_type_map, boosts={"a": 0.5, "b": -1.0})
+        np.testing.assert_allclose(boosted.score(candidates), [scores[0] * 1.5, 0.0])
+        self.assertIsNotNone(boosted.source_order(["a"]))
+        self.assertIsNone(boosted.source_order(["a", "b"]))
+
+    def test_recency_decay(self):
+        candidates = batch(
+            ("a", NOW - timedelta(hours=24), NOW),
+            ("a", None, NOW - timedelta(hours=1)),
+            ("b", NOW - timedelta(hours=24), NOW),
+            ("c", NOW - timedelta(hours=48), NOW),
+        )
+        ranker = RecencyDecayRanker(
+            half_life_hours=24,
+            source_weights={"b": 2.0},
+            boosts={"c": 1.0},
+            now=NOW.timestamp(),
+        )
+        scores = ranker.score(candidates)
+        np.testing.assert_allclose(scores, [0.5, 0.5 ** (1 / 24), 1.0, 1.25])
+        self.assertEqual(list(candidates.ids[candidates.order(scores)]), [4, 3, 2, 1])
+
+    def test_build_ranker(self):
+        ranker = build_ranker(
+            {"type": "recency_decay", "half_life_hours": 6, "type_weights": {"rss": 2.0}, "boosts": {"a": 0.1}},
+            {"a": "rss"},
+            {"a": 0.5},
+        )
+        self.assertIsInstance(ranker, RecencyDecayRanker)
+        self.assertEqual(ranker.half_life_hours, 6)
+        self.assertEqual(ranker.weight_for("a"), 1.0)
+        self.assertIsInstance(build_ranker(None, {}), TimestampRanker)
+        self.assertIsNone(build_ranker({"type_weights": {"rss": 0}}, {"a": "rss"}).source_order(["a"]))
+        with self.assertRaises(ValueError):
+            build_ranker({"type": "random"}, {})
+        with self.assertRaises(TypeError):
+            Ranker()
+
+
+if __name__ == "__main__":
+    unittest.main()
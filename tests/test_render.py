@@ -1,7 +1,9 @@
+import os
+import tempfile
 import unittest
 from pathlib import Path
 
-from src.templating.render import prepare_render_data, render_newsletter
+from src.templating.render import configure_template_cache, get_env, prepare_render_data, render_newsletter
 
 
 class RenderTests(unittest.TestCase):
@@ -27,6 +29,24 @@ class RenderTests(unittest.TestCase):
         self.assertIn("Unsubscribe", text_body)
         self.assertIn("img", html_body)
 
+    def test_env_cached_and_reloaded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            configure_template_cache(str(Path(tmp) / "bytecode"))
+            self.addCleanup(configure_template_cache, None)
+            template_dir = Path(tmp) / "templates"
+            template_dir.mkdir()
+            template = template_dir / "t.j2"
+            template.write_text("v1 {{ name }}")
+
+            self.assertIs(get_env(template_dir), get_env(template_dir))
+            self.assertEqual(render_newsletter(template_dir, "t.j2", "t.j2", {"name": "x"}), ("v1 x", "v1 x"))
+            self.assertTrue(any((Path(tmp) / "bytecode").iterdir()))
+
+            template.write_text("v2 {{ name }}")
+            stat = template.stat()
+            os.utime(template, (stat.st_atime, stat.st_mtime + 5))
+            self.assertEqual(render_newsletter(template_dir, "t.j2", "t.j2", {"name": "x"}), ("v2 x", "v2 x"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.models import Base, EmailSent, EngagementDaily, Event, Item, NewsletterRun, NewsletterRunItem
+from src.selection.engagement import engagement_boosts
+from src.tracking.rollup import DOMAIN, SOURCE, rollup_engagement
+
+NOW = datetime(2024, 5, 1, 12, 0)
+
+
+class RollupTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+        earlier = NOW - timedelta(hours=1)
+
+        a = Item(source_id="s-a", content_text="a", links=["https://www.a.com/x"], ingested_at=earlier, fingerprint="1")
+        b = Item(source_id="s-b", content_text="b", url="https://b.com/y", ingested_at=earlier, fingerprint="2")
+        run = NewsletterRun(newsletter_id="n", period_start=earlier, period_end=NOW)
+        self.session.add_all([a, b, run])
+        self.session.flush()
+        self.session.add_all(
+            [
+                NewsletterRunItem(run_id=run.id, item_id=a.id, rank=1),
+                NewsletterRunItem(run_id=run.id, item_id=b.id, rank=2),
+            ]
+        )
+        self.emails = [
+            EmailSent(run_id=run.id, recipient_email=f"u{i}@example.com", status=status, created_at=earlier)
+            for i, status in enumerate(["sent", "sent", "failed"])
+        ]
+        self.session.add_all(self.emails)
+        self.session.flush()
+        self.add_event("open", None, earlier)
+        self.add_event("click", "https://www.a.com/x", earlier)
+        self.add_event("click", "https://b.com/y", earlier)
+        self.session.commit()
+
+    def add_event(self, type_, link, timestamp):
+        self.session.add(Event(email_id=self.emails[0].id, type=type_, link_url=link, timestamp=timestamp))
+        self.session.flush()
+
+    def counts(self, dimension, key):
+        row = self.session.execute(
+            select(EngagementDaily).where(EngagementDaily.dimension == dimension, EngagementDaily.key == key)
+        ).scalar_one()
+        return row.sends, row.opens, row.clicks
+
+    def test_incremental_rollup(self):
+        stats = rollup_engagement(self.session, now=NOW)
+        self.session.commit()
+        self.assertEqual((stats.sends, stats.opens, stats.clicks), (2, 1, 2))
+        self.assertEqual(self.counts(SOURCE, "s-a"), (2, 1, 1))
+        self.assertEqual(self.counts(DOMAIN, "a.com"), (2, 1, 1))
+        self.assertEqual(self.counts(DOMAIN, "b.com"), (2, 1, 1))
+
+        self.assertEqual(rollup_engagement(self.session, now=NOW).clicks, 0)
+        self.add_event("click", "https://www.a.com/x", NOW - timedelta(minutes=30))
+        self.add_event("click", "https://www.a.com/x", NOW)
+        self.assertEqual(rollup_engagement(self.session, now=NOW).clicks, 1)
+        self.assertEqual(self.counts(SOURCE, "s-a"), (2, 1, 2))
+        # The event inside the lag window is picked up on a later run.
+        self.assertEqual(rollup_engagement(self.session, now=NOW + timedelta(hours=1)).clicks, 1)
+        self.assertEqual(self.counts(SOURCE, "s-a"), (2, 1, 3))
+
+    def test_boosts_follow_click_through(self):
+        self.add_event("click", "https://www.a.com/x", NOW - timedelta(minutes=30))
+        rollup_engagement(self.session, now=NOW)
+        boosts = engagement_boosts(self.session, ["s-a", "s-b"], days=30, weight=1.0, today=NOW.date())
+        self.assertGreater(boosts["s-a"], 0)
+        self.assertLess(boosts["s-b"], 0)
+        self.assertEqual(engagement_boosts(self.session, ["s-c"], days=30, weight=1.0, today=NOW.date()), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,19 @@
+import random
 import unittest
 from datetime import datetime, timedelta, timezone
+from itertools import product
 
 from src.db.models import Item
 from src.db.session import get_session, init_engine
+from src.ingestion.normalise import ItemData
+from src.ingestion.store import insert_items
 from src.selection.policy import select_items
+from src.selection.ranker import RecencyDecayRanker, TimestampRanker, score_item
+
+STORY = (
+    "The city council approved the new cycling plan on Tuesday, adding forty kilometres of "
+    "protected lanes and a bike share scheme that will open to residents next spring."
+)
 
 
 class SelectionTests(unittest.TestCase):
@@ -12,12 +22,13 @@ class SelectionTests(unittest.TestCase):
         init_engine("sqlite:///:memory:")
         with get_session() as session:
             now = datetime.now(timezone.utc)
-            session.add_all(
+            insert_items(
+                session,
                 [
-                    Item(source_id="s1", title="A", content_text="x", ingested_at=now, fingerprint="f1"),
-                    Item(source_id="s1", title="B", content_text="x", ingested_at=now, fingerprint="f2"),
-                    Item(source_id="s2", title="C", content_text="x", ingested_at=now, fingerprint="f3"),
-                ]
+                    ItemData("s1", "A", "x", None, None, now, [], "f1"),
+                    ItemData("s1", "B", "x", None, None, now, [], "f2"),
+                    ItemData("s2", "C", "x", None, None, now, [], "f3"),
+                ],
             )
             session.commit()
 
@@ -29,11 +40,149 @@ class SelectionTests(unittest.TestCase):
                 window_days=1,
                 max_items_total=2,
                 per_source_limit=1,
-                source_type_map={"s1": "rss", "s2": "rss"},
-                weights={},
+                ranker=TimestampRanker(source_type_map={"s1": "rss", "s2": "rss"}),
             )
             self.assertEqual(len(items), 2)
 
+    def test_no_sources(self):
+        with get_session() as session:
+            items = select_items(
+                session,
+                source_ids=[],
+                window_days=1,
+                max_items_total=5,
+                per_source_limit=1,
+                ranker=TimestampRanker(),
+            )
+            self.assertEqual(items, [])
+
+    def test_more_sources_than_one_compound_select(self):
+        now = datetime.now(timezone.utc)
+        source_ids = [f"many-{i}" for i in range(600)]
+        with get_session() as session:
+            insert_items(
+                session,
+                [
+                    ItemData(source_id, f"M{i}", "x", None, now - timedelta(minutes=i), now, [], f"many{i}")
+                    for i, source_id in enumerate(source_ids)
+                ],
+            )
+            session.commit()
+            items = select_items(
+                session,
+                source_ids=source_ids,
+                window_days=1,
+                max_items_total=5,
+                per_source_limit=1,
+                ranker=TimestampRanker(),
+            )
+            self.assertEqual([item.source_id for item in items], source_ids[:5])
+
+    def test_near_duplicates_across_sources_dropped(self):
+        now = datetime.now(timezone.utc)
+        published = [now - timedelta(hours=h) for h in range(3)]
+        with get_session() as session:
+            insert_items(
+                session,
+                [
+                    ItemData("feed-a", "Cycling plan", STORY, None, published[0], now, [], "a1"),
+                    ItemData("mail-b", "Fwd: Cycling plan", STORY + " Read more.", None, published[1], now, [], "b1"),
+                    ItemData("feed-c", "Budget", "The budget vote was postponed until next month.", None, published[2], now, [], "c1"),
+                ],
+            )
+            session.commit()
+
+            kwargs = dict(
+                source_ids=["feed-a", "mail-b", "feed-c"],
+                window_days=1,
+                max_items_total=10,
+                per_source_limit=None,
+                ranker=TimestampRanker(),
+            )
+            self.assertEqual(len(select_items(session, **kwargs)), 3)
+            items = select_items(session, dedupe_across_sources=True, **kwargs)
+            self.assertEqual([item.source_id for item in items], ["feed-a", "feed-c"])
+
+    def test_matches_full_python_ranking(self):
+        rng = random.Random(3)
+        now = datetime.now(timezone.utc)
+        source_ids = [f"rank-{i}" for i in range(5)]
+        type_map = {source_id: rng.choice(["rss", "website_change", "gmail_inbox"]) for source_id in source_ids}
+        weights = {"rss": 1.0, "website_change": 1.1, "gmail_inbox": 0.9}
+        boosts = {"rank-1": 0.3}
+        # A -100% lift zeroes rank-2, which rules out the per-source SQL cut.
+        scaled = {"rank-1": 0.3, "rank-2": -1.0}
+        clock = now.timestamp()
+        decay = RecencyDecayRanker(source_type_map=type_map, half_life_hours=6, boosts=boosts, now=clock)
+
+        def decay_score(item):
+            timestamp = (item.published_at or item.ingested_at).replace(tzinfo=timezone.utc).timestamp()
+            weight = weights[type_map[item.source_id]]
+            return weight * 0.5 ** ((clock - timestamp) / 3600 / 6) + boosts.get(item.source_id, 0.0)
+
+        rankers = [
+            (
+                TimestampRanker(source_type_map=type_map),
+                lambda item: score_item(item.published_at, type_map[item.source_id], weights),
+            ),
+            (
+                TimestampRanker(source_type_map=type_map, boosts=scaled),
+                lambda item: score_item(item.published_at, type_map[item.source_id], weights)
+                * (1.0 + scaled.get(item.source_id, 0.0)),
+            ),
+            (decay, decay_score),
+        ]
+        rows = []
+        for i in range(300):
+            published = None if i % 17 == 0 else now - timedelta(minutes=rng.randrange(2000))
+            ingested = now - timedelta(minutes=rng.randrange(600))
+            rows.append(
+                # Every 250th item repeats an earlier story in another source.
+                ItemData(
+                    source_id=source_ids[(i + i // 250) % len(source_ids)],
+                    title=f"R{i % 250}",
+                    content_text=f"story {i % 250}",
+                    url=None,
+                    published_at=published,
+                    ingested_at=ingested,
+                    links=[],
+                    fingerprint=f"rank{i % 250}",
+                )
+            )
+        with get_session() as session:
+            insert_items(session, rows)
+            session.commit()
+            everything = session.query(Item).filter(Item.source_id.in_(source_ids)).all()
+
+            cases = [(3, 10, False), (None, 25, False), (20, 60, True), (2, 8, True)]
+            for (ranker, score), (per_source_limit, max_total, dedupe) in product(rankers, cases):
+                expected = []
+                counts = {}
+                seen = set()
+                ranked = sorted(everything, key=lambda item: (-score(item), -item.id))
+                for item in ranked:
+                    if dedupe and item.fingerprint in seen:
+                        continue
+                    if per_source_limit is not None and counts.get(item.source_id, 0) >= per_source_limit:
+                        continue
+                    expected.append(item.id)
+                    counts[item.source_id] = counts.get(item.source_id, 0) + 1
+                    seen.add(item.fingerprint)
+                    if len(expected) >= max_total:
+                        break
+
+                items = select_items(
+                    session,
+                    source_ids=source_ids,
+                    window_days=1,
+                    max_items_total=max_total,
+                    per_source_limit=per_source_limit,
+                    ranker=ranker,
+                    dedupe_across_sources=dedupe,
+                    near_duplicate_distance=0,
+                )
+                self.assertEqual([item.id for item in items], expected)
+
 
 if __name__ == "__main__":
     unittest.main()
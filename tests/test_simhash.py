@@ -0,0 +1,38 @@
+import random
+import unittest
+
+from src.utils.simhash import SimHashIndex, hamming, signature_hex, simhash
+
+
+def article(seed: int, length: int = 200) -> str:
+    rng = random.Random(seed)
+    return " ".join(f"word{rng.randrange(5000)}" for _ in range(length))
+
+
+class SimHashTests(unittest.TestCase):
+    def test_similar_texts_are_close(self):
+        text = article(1)
+        edited = "Fwd: " + text + " Subscribe to our newsletter."
+        self.assertEqual(simhash(text), simhash(text.upper()))
+        self.assertLessEqual(hamming(simhash(text), simhash(edited)), 8)
+        self.assertGreater(hamming(simhash(text), simhash(article(2))), 10)
+        self.assertIsNone(simhash("  ... "))
+        self.assertEqual(len(signature_hex(simhash(text))), 16)
+
+    def test_index_finds_all_within_distance(self):
+        rng = random.Random(7)
+        index = SimHashIndex(max_distance=3)
+        base = rng.getrandbits(64)
+        for key in range(2000):
+            index.add(key, rng.getrandbits(64))
+        flipped = base
+        for bit in rng.sample(range(64), 3):
+            flipped ^= 1 << bit
+        index.add("near", flipped)
+
+        self.assertEqual(index.near(base), ["near"])
+        self.assertEqual(len(index), 2001)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from src.db.models import SnapshotContent, SnapshotSighting
+from src.db.session import get_session, init_engine
+from src.ingestion.snapshot_store import latest_snapshot, prune_snapshots, record_snapshot
+from src.ingestion.website_change import WebsiteSnapshot
+from src.utils.hashing import sha256_text
+
+
+def snapshot(text: str) -> WebsiteSnapshot:
+    return WebsiteSnapshot(content_hash=sha256_text(text), content_text=text)
+
+
+class SnapshotStoreTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        init_engine("sqlite:///:memory:")
+
+    def test_content_stored_once_and_loaded_lazily(self):
+        page = "changelog entry " * 500
+        with get_session() as session:
+            for _ in range(3):
+                record_snapshot(session, "site-a", "https://a.example", snapshot(page))
+            record_snapshot(session, "site-b", "https://b.example", snapshot(page))
+
+            contents = session.execute(
+                select(func.count()).select_from(SnapshotContent).where(
+                    SnapshotContent.content_hash == sha256_text(page)
+                )
+            ).scalar()
+            sightings = session.execute(
+                select(func.count()).select_from(SnapshotSighting).where(SnapshotSighting.source_id == "site-a")
+            ).scalar()
+            self.assertEqual(contents, 1)
+            self.assertEqual(sightings, 3)
+
+            blob = session.execute(
+                select(SnapshotContent.content_blob).where(SnapshotContent.content_hash == sha256_text(page))
+            ).scalar_one()
+            self.assertLess(len(blob), len(page) // 10)
+
+            previous = latest_snapshot(session, "site-a")
+        self.assertEqual(previous.content_hash, sha256_text(page))
+        self.assertIsNone(previous.content_text)
+        self.assertEqual(previous.text(), page)
+
+    def test_prune_drops_unreferenced_content(self):
+        with get_session() as session:
+            record_snapshot(session, "site-c", "https://c.example", snapshot("old page"))
+            session.query(SnapshotSighting).filter(SnapshotSighting.source_id == "site-c").update(
+                {SnapshotSighting.created_at: datetime.utcnow() - timedelta(days=90)}
+            )
+            session.commit()
+
+            prune_snapshots(session, datetime.utcnow() - timedelta(days=45))
+            session.commit()
+
+            self.assertIsNone(latest_snapshot(session, "site-c"))
+            remaining = session.execute(
+                select(SnapshotContent.id).where(SnapshotContent.content_hash == sha256_text("old page"))
+            ).first()
+            self.assertIsNone(remaining)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from src.db.session import get_session, init_engine
+from src.ingestion.normalise import ItemData
+from src.ingestion.store import insert_items, insert_items_one_by_one
+from src.utils.time import now_utc
+
+
+def items(source_id, count, prefix="fp"):
+    now = now_utc()
+    return [ItemData(source_id, f"T{i}", "text", None, None, now, [], f"{prefix}{i}") for i in range(count)]
+
+
+class StoreTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        init_engine("sqlite:///:memory:")
+
+    def test_bulk_insert_counts_conflicts(self):
+        with get_session() as session:
+            first = insert_items(session, items("store-a", 25), batch_size=10)
+            session.commit()
+            self.assertEqual((first.inserted, first.skipped), (25, 0))
+            self.assertEqual(len(set(first.inserted_ids)), 25)
+
+            batch = items("store-a", 30) + items("store-a", 3)
+            second = insert_items(session, batch, batch_size=7)
+            session.commit()
+            self.assertEqual((second.inserted, second.skipped), (5, 28))
+
+            other_source = insert_items(session, items("store-b", 5))
+            session.commit()
+            self.assertEqual(other_source.inserted, 5)
+
+    def test_fallback_matches_bulk(self):
+        with get_session() as session:
+            insert_items(session, items("store-c", 4))
+            result = insert_items_one_by_one(session, items("store-c", 6))
+            session.commit()
+            self.assertEqual((result.inserted, result.skipped), (2, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
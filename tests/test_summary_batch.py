@@ -0,0 +1,73 @@
+import json
+import re
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.models import Base
+from src.summarisation.batch import ITEM_OVERHEAD_TOKENS, pack_batches, parse_batch_response, summarize_batch
+from src.summarisation.provider import SummaryRequest
+from src.summarisation.service import summarize_requests
+
+
+def request(content, tone="factual"):
+    return SummaryRequest(style="bullets", length="short", tone=tone, language="en-GB", content=content)
+
+
+class BatchProvider:
+    name = "fake:batch"
+
+    def __init__(self, drop=()):
+        self.drop = set(drop)
+        self.prompts = []
+        self.single = []
+
+    def complete(self, system, prompt, json_output=False):
+        items = json.loads(re.search(r"^\[.*?^\]", prompt, re.S | re.M).group(0))
+        self.prompts.append([item["content"] for item in items])
+        reply = {}
+        for item in items:
+            if item["content"] in self.drop:
+                self.drop.discard(item["content"])
+                continue
+            reply[item["id"]] = f"batched {item['content']}"
+        return "```json\n" + json.dumps(reply) + "\n```"
+
+    def summarize(self, request):
+        self.single.append(request.content)
+        return f"single {request.content}"
+
+
+class BatchTests(unittest.TestCase):
+    def test_pack_batches_by_rules_size_and_budget(self):
+        entries = [(str(i), request("x" * 400)) for i in range(5)]
+        entries.append(("other", request("x", tone="playful")))
+        entries.append(("huge", request("x" * 40000)))
+        batches = pack_batches(entries, max_items=3, max_tokens=3 * (101 + ITEM_OVERHEAD_TOKENS))
+        keys = [[key for key, _ in batch] for batch in batches]
+        self.assertEqual(keys, [["0", "1", "2"], ["3", "4"], ["other"], ["huge"]])
+
+    def test_parse_batch_response(self):
+        self.assertEqual(parse_batch_response('Sure! {"1": " a ", "3": 4}', 3), ["a", None, None])
+        self.assertEqual(parse_batch_response("not json", 2), [None, None])
+
+    def test_retries_only_unparsed_items(self):
+        provider = BatchProvider(drop={"b", "c"})
+        summaries = summarize_batch(provider, [request(c) for c in "abcd"])
+        self.assertEqual(summaries, ["batched a", "batched b", "batched c", "batched d"])
+        self.assertEqual(provider.prompts, [["a", "b", "c", "d"], ["b", "c"]])
+
+    def test_service_falls_back_to_single_requests(self):
+        provider = BatchProvider(drop={"b"})
+        engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        summaries = summarize_requests(session, provider, [request(c) for c in "abc"], max_workers=2, batch_size=8)
+        self.assertEqual(summaries, ["batched a", "single b", "batched c"])
+        self.assertEqual(provider.single, ["b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
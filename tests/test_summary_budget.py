@@ -0,0 +1,78 @@
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.models import Base
+from src.summarisation.budget import TokenBudget, estimate_tokens, split_chunks, strip_boilerplate, truncate_to_tokens
+from src.summarisation.provider import SummaryRequest
+from src.summarisation.service import summarize_requests
+
+SENTENCE = "The council approved the cycling plan after a long debate. "
+
+
+def story(count):
+    return "".join(f"Point {i}: the council approved the cycling plan after a debate. " for i in range(count))
+
+
+class RecordingProvider:
+    name = "fake:budget"
+
+    def __init__(self):
+        self.contents = []
+
+    def summarize(self, request):
+        self.contents.append(request.content)
+        return f"<{request.content[:8]}>"
+
+
+class BudgetTests(unittest.TestCase):
+    def test_strip_boilerplate(self):
+        text = (
+            "Home. News. Sport.\n"
+            "The council approved the plan. View this email in your browser.\n"
+            "Home. News. Sport.\n"
+            "Click here to unsubscribe. © 2024 Example Ltd. All rights reserved."
+        )
+        self.assertEqual(strip_boilerplate(text), "Home. News. Sport.\nThe council approved the plan.")
+
+    def test_truncate_ends_on_sentence(self):
+        text = SENTENCE * 20
+        cut = truncate_to_tokens(text, 100)
+        self.assertLessEqual(len(cut), 400)
+        self.assertTrue(cut.endswith("debate."))
+        self.assertEqual(truncate_to_tokens("short", 100), "short")
+
+    def test_split_chunks_within_budget(self):
+        chunks = split_chunks(SENTENCE * 100 + "x" * 5000, 200)
+        self.assertTrue(all(len(chunk) <= 800 for chunk in chunks))
+        self.assertEqual(sum(chunk.count("debate") for chunk in chunks), 100)
+
+    def test_plan(self):
+        budget = TokenBudget(max_input_tokens=100, map_reduce_tokens=300, max_chunks=3)
+        self.assertEqual(budget.plan("Short item."), ["Short item."])
+        medium = budget.plan(story(15))
+        self.assertEqual(len(medium), 1)
+        self.assertLessEqual(estimate_tokens(medium[0]), 100)
+        long = budget.plan(story(200))
+        self.assertEqual(len(long), 3)
+
+    def test_map_reduce(self):
+        engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        provider = RecordingProvider()
+        budget = TokenBudget(max_input_tokens=100, map_reduce_tokens=300, max_chunks=3)
+        requests = [SummaryRequest("bullets", "short", "factual", "en-GB", story(200))]
+
+        summaries = summarize_requests(session, provider, requests, max_workers=3, budget=budget)
+        merged = provider.contents[-1]
+        self.assertEqual(len(provider.contents), 4)
+        self.assertEqual(merged.split("\n\n")[0], "<Point 0:>")
+        self.assertEqual(len(merged.split("\n\n")), 3)
+        self.assertEqual(summaries, [f"<{merged[:8]}>"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.models import Base, SummaryCacheEntry
+from src.summarisation.cache import SummaryCache, evict_summaries, summary_key
+from src.summarisation.provider import SummaryRequest, simple_summarize
+from src.summarisation.service import summarize_requests
+
+
+class CountingProvider:
+    name = "fake:model"
+
+    def __init__(self):
+        self.calls = []
+
+    def summarize(self, request):
+        self.calls.append(request.content)
+        return f"summary of {request.content}"
+
+
+class FlakyProvider(CountingProvider):
+    def summarize(self, request):
+        if request.content.startswith("bad"):
+            raise RuntimeError("timeout")
+        return super().summarize(request)
+
+
+def request(content, tone="factual"):
+    return SummaryRequest(style="bullets", length="short", tone=tone, language="en-GB", content=content)
+
+
+class SummaryCacheTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+    def test_key_covers_prompt_parameters(self):
+        self.assertEqual(summary_key("a", request("x")), summary_key("a", request("x")))
+        self.assertNotEqual(summary_key("a", request("x")), summary_key("b", request("x")))
+        self.assertNotEqual(summary_key("a", request("x")), summary_key("a", request("y")))
+        self.assertNotEqual(summary_key("a", request("x")), summary_key("a", request("x", tone="playful")))
+
+    def test_hits_skip_provider(self):
+        provider = CountingProvider()
+        first = summarize_requests(self.session, provider, [request("a"), request("b"), request("a")])
+        self.assertEqual(first, ["summary of a", "summary of b", "summary of a"])
+        self.assertEqual(provider.calls, ["a", "b"])
+
+        second = summarize_requests(self.session, provider, [request("b"), request("c")])
+        self.assertEqual(second, ["summary of b", "summary of c"])
+        self.assertEqual(provider.calls, ["a", "b", "c"])
+
+        cache = SummaryCache(self.session)
+        cache.get_many([summary_key(provider.name, request("a")), "missing"])
+        self.assertEqual(cache.stats.hit_rate, 0.5)
+
+    def test_concurrent_misses_keep_order_and_fall_back(self):
+        provider = FlakyProvider()
+        contents = ["a. one", "bad. two", "c. three", "d. four"]
+        summaries = summarize_requests(self.session, provider, [request(c) for c in contents], max_workers=4)
+        fallback = simple_summarize(request("bad. two"))
+        self.assertEqual(summaries, ["summary of a. one", fallback, "summary of c. three", "summary of d. four"])
+
+        summarize_requests(self.session, provider, [request(c) for c in contents], max_workers=4)
+        self.assertEqual(sorted(provider.calls), ["a. one", "c. three", "d. four"])
+
+    def test_evicts_by_age_then_size(self):
+        now = datetime(2024, 5, 1)
+        for i, age in enumerate([40, 3, 2, 1]):
+            used = now - timedelta(days=age)
+            self.session.add(
+                SummaryCacheEntry(key=str(i), provider="p", summary="s", created_at=used, last_used_at=used)
+            )
+        self.session.flush()
+
+        self.assertEqual(evict_summaries(self.session, max_age_days=30, max_entries=2, now=now), 2)
+        keys = self.session.execute(select(SummaryCacheEntry.key).order_by(SummaryCacheEntry.key)).scalars().all()
+        self.assertEqual(keys, ["2", "3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+
+from src.summarisation.limits import ProviderLimits, RateLimitedProvider, TokenBucket
+from src.summarisation.provider import SummaryRequest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class SlowProvider:
+    def __init__(self, name):
+        self.name = name
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def summarize(self, request):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return request.content
+
+
+class LimitTests(unittest.TestCase):
+    def test_bucket_spaces_requests_after_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock, sleep=clock.sleep)
+        for _ in range(60):
+            bucket.acquire()
+        self.assertEqual(clock.sleeps, [])
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(clock.sleeps, [1.0, 1.0])
+
+    def test_bucket_caps_oversized_requests(self):
+        clock = FakeClock()
+        bucket = TokenBucket(100, clock=clock, sleep=clock.sleep)
+        bucket.acquire(500)
+        bucket.acquire(30)
+        self.assertEqual(clock.sleeps, [18.0])
+
+    def test_provider_concurrency(self):
+        provider = SlowProvider("test:concurrency")
+        limited = RateLimitedProvider(provider, ProviderLimits(concurrency=2))
+        request = SummaryRequest("bullets", "short", "factual", "en-GB", "x")
+        threads = [threading.Thread(target=limited.summarize, args=(request,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(provider.peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.models import Base, SummaryJob
+from src.ingestion.normalise import ItemData
+from src.ingestion.store import insert_items
+from src.summarisation.queue import rules_by_source, summarize_pending
+
+TEMPLATES = [
+    {"template_id": "daily", "summary_rules": {"style": "bullets", "length": "short"}},
+    {"template_id": "weekly", "summary_rules": {"style": "paragraph", "length": "long"}},
+]
+NEWSLETTERS = [
+    {"newsletter_id": "a", "template_id": "daily", "sources": ["s1", "s2"]},
+    {"newsletter_id": "b", "template_id": "daily", "sources": ["s1"]},
+    {"newsletter_id": "c", "template_id": "weekly", "sources": ["s1"]},
+]
+
+
+class SummaryQueueTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+        now = datetime(2024, 5, 1)
+        insert_items(
+            self.session,
+            [
+                ItemData("s1", "A", "alpha", None, None, now, [], "f1"),
+                ItemData("s2", "B", "beta", None, None, now, [], "f2"),
+                ItemData("s3", "C", "gamma", None, None, now, [], "f3"),
+            ],
+        )
+
+    def jobs(self):
+        return self.session.execute(select(func.count()).select_from(SummaryJob)).scalar_one()
+
+    def test_no_jobs_without_provider(self):
+        item = ItemData("s1", "D", "delta", None, None, datetime(2024, 5, 1), [], "f4")
+        insert_items(self.session, [item], enqueue_summaries=False)
+        self.assertEqual(self.jobs(), 3)
+
+    def test_rules_by_source(self):
+        rules = rules_by_source(NEWSLETTERS, TEMPLATES)
+        self.assertEqual([r["style"] for r in rules["s1"]], ["bullets", "paragraph"])
+        self.assertEqual([r["style"] for r in rules["s2"]], ["bullets"])
+        self.assertNotIn("s3", rules)
+
+    def test_summarises_queued_items_once(self):
+        self.assertEqual(self.jobs(), 3)
+        calls = []
+
+        def summarize(requests):
+            calls.append([(r.content, r.style) for r in requests])
+            return ["" for _ in requests]
+
+        rules = rules_by_source(NEWSLETTERS, TEMPLATES)
+        self.assertEqual(summarize_pending(self.session, summarize, rules, limit=2), 2)
+        self.assertEqual(calls, [[("alpha", "bullets"), ("alpha", "paragraph"), ("beta", "bullets")]])
+        self.assertEqual(summarize_pending(self.session, summarize, rules, limit=2), 1)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(summarize_pending(self.session, summarize, rules, limit=2), 0)
+        self.assertEqual(self.jobs(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
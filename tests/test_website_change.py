@@ -0,0 +1,34 @@
+import unittest
+
+from src.ingestion.website_change import diff_ratio, extract_content
+
+PAGE = """<html><head><title>Changelog</title></head><body>
+<nav><a href="/home">Home</a></nav>
+<main><h1>Release 2.0</h1><p>Faster polling.</p><a href="/notes">Notes</a></main>
+<footer>Footer text</footer></body></html>"""
+
+
+class WebsiteChangeTests(unittest.TestCase):
+    def test_extract_content(self):
+        title, text, links = extract_content(PAGE, "main", None, ["nav", "footer"], True)
+        self.assertEqual(title, "Changelog")
+        self.assertEqual(text, "Release 2.0 Faster polling. Notes")
+        self.assertEqual(links, ["/notes"])
+
+    def test_shingle_diff_ratio(self):
+        old = " ".join(f"paragraph {i} describes release notes for version {i}." for i in range(200))
+        self.assertEqual(diff_ratio(old, old, "shingle"), 0.0)
+
+        small_edit = old.replace("version 150.", "version 150b.")
+        self.assertLess(diff_ratio(old, small_edit, "shingle"), 0.05)
+
+        rewritten = " ".join(f"entirely new entry {i} about other things." for i in range(200))
+        self.assertGreater(diff_ratio(old, rewritten, "shingle"), 0.9)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            diff_ratio("a", "b", "nope")
+
+
+if __name__ == "__main__":
+    unittest.main()